@@ -90,6 +90,15 @@ DATABASES["default"]["OPTIONS"].update({
 # Dev: no persistent connections
 DATABASES["default"]["CONN_MAX_AGE"] = 0
 
+# --- Authentication ---
+# Same as ModelBackend, but fetches request.user together with its profile.
+# ModelBackend stays listed: sessions created before the switch carry its path in
+# _auth_user_backend, and get_user() drops sessions naming an unlisted backend.
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.ProfileModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 # --- Password validation ---
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -82,6 +82,15 @@ DATABASES["default"]["OPTIONS"].update({
 })
 DATABASES["default"]["CONN_MAX_AGE"] = 300  # keep connections warm in prod
 
+# --- Authentication ---
+# Same as ModelBackend, but fetches request.user together with its profile.
+# ModelBackend stays listed: sessions created before the switch carry its path in
+# _auth_user_backend, and get_user() drops sessions naming an unlisted backend.
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.ProfileModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 # --- Password validation ---
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -109,12 +118,14 @@ STORAGES = {
     "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
 }
 
-# --- Cache (single-host safe default) ---
+# --- Cache ---
+# CACHE_URL selects the backend, e.g. "rediscache://127.0.0.1:6379/1" or
+# "dbcache://envy_cache" (after `manage.py createcachetable`). Set it to a shared
+# backend whenever more than one worker process serves the app: the timetracking
+# cache versions are only invalidated across workers through a shared cache;
+# with the per-process default they just expire (see timetracking.utils.VERSION_TTL).
 CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "envy-studio-cache",
-    }
+    "default": env.cache("CACHE_URL", default="locmemcache://envy-studio-cache"),
 }
 
 # --- Email (disabled) ---
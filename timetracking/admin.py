@@ -5,11 +5,20 @@ from typing import Any
 
 from django import forms
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.db import models
 from django.db.models import Count, Q, Sum
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, StreamingHttpResponse
 
 from .models import TrackedProject, TrackedTask, TimeEntry
+from .utils import bump_entries_version, bump_options_version
+
+
+class _Echo:
+    """File-like sink for csv.writer: writerow() returns the formatted line instead of buffering it."""
+
+    def write(self, value: str) -> str:
+        return value
 
 
 # ----------------------------
@@ -48,6 +57,14 @@ class BillableFilter(admin.SimpleListFilter):
         return queryset
 
 
+class TaskListFilter(admin.RelatedFieldListFilter):
+    """Task choices are labelled with str(task), which reads the project: fetch it in the same query."""
+
+    def field_choices(self, field, request: HttpRequest, model_admin: admin.ModelAdmin):
+        ordering = self.field_admin_ordering(field, request, model_admin) or TrackedTask._meta.ordering
+        return [(t.pk, str(t)) for t in TrackedTask.objects.select_related("project").order_by(*ordering)]
+
+
 # ----------------------------
 # Inlines
 # ----------------------------
@@ -95,13 +112,17 @@ class TrackedProjectAdmin(admin.ModelAdmin):
         return getattr(obj, "_entry_count", 0)
 
     # Bulk actions
+    # update() bypasses save()/signals: drop the mirror hash to force the next re-sync,
+    # and invalidate the cached option lists by hand.
     @admin.action(description="Mark selected projects as ACTIVE")
     def mark_active(self, request: HttpRequest, queryset: models.QuerySet):
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, content_hash=None)
+        bump_options_version()
 
     @admin.action(description="Mark selected projects as INACTIVE")
     def mark_inactive(self, request: HttpRequest, queryset: models.QuerySet):
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, content_hash=None)
+        bump_options_version()
 
     actions = ("mark_active", "mark_inactive")
 
@@ -137,14 +158,16 @@ class TrackedTaskAdmin(admin.ModelAdmin):
     def entry_count(self, obj: TrackedTask) -> int:
         return getattr(obj, "_entry_count", 0)
 
-    # Bulk actions
+    # Bulk actions (update() sends no signals; invalidate the option lists by hand)
     @admin.action(description="Mark selected tasks as ACTIVE")
     def mark_active(self, request: HttpRequest, queryset: models.QuerySet):
         queryset.update(is_active=True)
+        bump_options_version()
 
     @admin.action(description="Mark selected tasks as INACTIVE")
     def mark_inactive(self, request: HttpRequest, queryset: models.QuerySet):
         queryset.update(is_active=False)
+        bump_options_version()
 
     actions = ("mark_active", "mark_inactive")
 
@@ -170,6 +193,34 @@ class TimeEntryAdminForm(forms.ModelForm):
         return cleaned
 
 
+class TimeEntryChangeList(ChangeList):
+    """
+    Changelist rows load only the columns list_display renders. Deferred in
+    get_results(), not get_queryset(): admin actions receive cl.get_queryset(),
+    which stays the full queryset so actions iterating instances don't pay a
+    deferred-field query per row.
+    """
+
+    def get_results(self, request: HttpRequest) -> None:
+        self.queryset = self.queryset.only(
+            "id",
+            "work_date",
+            "duration_minutes",
+            "billable",
+            "notes",
+            "created_at",
+            "user",
+            "user__username",
+            "project",
+            "project__title",
+            "task",
+            "task__title",
+            "task__project",
+            "task__project__title",
+        )
+        super().get_results(request)
+
+
 @admin.register(TimeEntry)
 class TimeEntryAdmin(admin.ModelAdmin):
     form = TimeEntryAdminForm
@@ -185,7 +236,7 @@ class TimeEntryAdmin(admin.ModelAdmin):
         "notes_short",
         "created_at",
     )
-    list_filter = (BillableFilter, "project", "task", "user")
+    list_filter = (BillableFilter, "project", ("task", TaskListFilter), "user")
     search_fields = (
         "notes",
         "project__title",
@@ -197,11 +248,15 @@ class TimeEntryAdmin(admin.ModelAdmin):
     autocomplete_fields = ("project", "task", "user")
     readonly_fields = ("uid", "created_at", "updated_at")
     fields = ("project", "task", "user", "work_date", "duration_minutes", "billable", "notes", "uid", "created_at", "updated_at")
-    list_select_related = ("project", "task", "user")
+    # The task column renders "<project> — <task>", hence task__project.
+    list_select_related = ("project", "task__project", "user")
     list_per_page = 50
 
     def get_queryset(self, request: HttpRequest):
-        return super().get_queryset(request).select_related("project", "task", "user")
+        return super().get_queryset(request).select_related("project", "task__project", "user")
+
+    def get_changelist(self, request: HttpRequest, **kwargs):
+        return TimeEntryChangeList
 
     # --------- nice display helpers ---------
 
@@ -224,51 +279,79 @@ class TimeEntryAdmin(admin.ModelAdmin):
 
     # --------- actions ---------
 
+    # update() sends no post_save: invalidate the owners' cached metrics by hand.
     @admin.action(description="Mark selected entries as BILLABLE")
     def mark_billable(self, request: HttpRequest, queryset: models.QuerySet):
+        user_ids = set(queryset.values_list("user_id", flat=True))
         queryset.update(billable=True)
+        for user_id in user_ids:
+            bump_entries_version(user_id)
 
     @admin.action(description="Mark selected entries as NON-billable")
     def mark_non_billable(self, request: HttpRequest, queryset: models.QuerySet):
+        user_ids = set(queryset.values_list("user_id", flat=True))
         queryset.update(billable=False)
+        for user_id in user_ids:
+            bump_entries_version(user_id)
 
     @admin.action(description="Export selected entries to CSV")
-    def export_csv(self, request: HttpRequest, queryset: models.QuerySet) -> HttpResponse:
-        qs = queryset.select_related("project", "task", "user")
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="time_entries.csv"'
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                "id",
-                "uid",
-                "work_date",
-                "user",
-                "project",
-                "task",
-                "duration_minutes",
-                "billable",
-                "notes",
-                "created_at",
-                "updated_at",
-            ]
+    def export_csv(self, request: HttpRequest, queryset: models.QuerySet) -> StreamingHttpResponse:
+        # Plain value tuples: only the exported columns, no model instances per row.
+        rows = queryset.values_list(
+            "pk",
+            "uid",
+            "work_date",
+            "user__username",
+            "project__title",
+            "task__title",
+            "duration_minutes",
+            "billable",
+            "notes",
+            "created_at",
+            "updated_at",
         )
-        for e in qs:
-            writer.writerow(
+        writer = csv.writer(_Echo())
+        yes_no = ("no", "yes")  # indexed by the billable bool
+
+        def lines():
+            yield writer.writerow(
                 [
-                    e.pk,
-                    str(e.uid),
-                    e.work_date.isoformat(),
-                    str(e.user),
-                    e.project.title,
-                    e.task.title,
-                    e.duration_minutes,
-                    "yes" if e.billable else "no",
-                    (e.notes or "").replace("\r", " ").replace("\n", " "),
-                    e.created_at.isoformat(timespec="seconds"),
-                    e.updated_at.isoformat(timespec="seconds"),
+                    "id",
+                    "uid",
+                    "work_date",
+                    "user",
+                    "project",
+                    "task",
+                    "duration_minutes",
+                    "billable",
+                    "notes",
+                    "created_at",
+                    "updated_at",
                 ]
             )
+            # Streamed in chunks: memory stays flat however many entries are selected.
+            for (
+                pk, uid, work_date, username, project_title, task_title,
+                minutes, billable, notes, created_at, updated_at,
+            ) in rows.iterator(chunk_size=2000):
+                yield writer.writerow(
+                    (
+                        pk,
+                        str(uid),
+                        work_date.isoformat(),
+                        username,
+                        project_title,
+                        task_title,
+                        minutes,
+                        yes_no[billable],
+                        (notes or "").replace("\r", " ").replace("\n", " "),
+                        created_at.isoformat(timespec="seconds"),
+                        updated_at.isoformat(timespec="seconds"),
+                    )
+                )
+
+        response = StreamingHttpResponse(lines(), content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="time_entries.csv"'
         return response
 
     actions = ("mark_billable", "mark_non_billable", "export_csv")
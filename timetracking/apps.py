@@ -1,5 +1,6 @@
 from django.apps import AppConfig
 from django.apps import apps as django_apps
+from django.contrib.auth import get_user_model
 from django.db.models.signals import post_save, post_delete
 
 
@@ -8,13 +9,28 @@ class TimetrackingConfig(AppConfig):
     name = "timetracking"
 
     def ready(self):
+        from . import checks  # noqa: F401  (registers the deploy checks)
         from . import signals as tt_signals
+        from .lookups import FullTextSearch
 
         Project = django_apps.get_model("projects", "Project")
         Task = django_apps.get_model("projects", "Task")
+        TimeEntry = self.get_model("TimeEntry")
+        TrackedProject = self.get_model("TrackedProject")
+        TrackedTask = self.get_model("TrackedTask")
+        User = get_user_model()
+
+        TimeEntry._meta.get_field("notes").register_lookup(FullTextSearch)
 
         # Connect lazily after apps are loaded to avoid import cycles
         post_save.connect(tt_signals.on_project_saved, sender=Project, dispatch_uid="tt_project_saved")
         post_delete.connect(tt_signals.on_project_deleted, sender=Project, dispatch_uid="tt_project_deleted")
         post_save.connect(tt_signals.on_task_saved, sender=Task, dispatch_uid="tt_task_saved")
         post_delete.connect(tt_signals.on_task_deleted, sender=Task, dispatch_uid="tt_task_deleted")
+        post_save.connect(tt_signals.on_entry_changed, sender=TimeEntry, dispatch_uid="tt_entry_saved")
+        post_delete.connect(tt_signals.on_entry_changed, sender=TimeEntry, dispatch_uid="tt_entry_deleted")
+        for model, name in ((TrackedProject, "tproject"), (TrackedTask, "ttask")):
+            post_save.connect(tt_signals.on_mirror_changed, sender=model, dispatch_uid=f"tt_{name}_saved")
+            post_delete.connect(tt_signals.on_mirror_changed, sender=model, dispatch_uid=f"tt_{name}_deleted")
+        post_save.connect(tt_signals.on_user_changed, sender=User, dispatch_uid="tt_user_saved")
+        post_delete.connect(tt_signals.on_user_changed, sender=User, dispatch_uid="tt_user_deleted")
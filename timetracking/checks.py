@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Timetracking invalidates its cached metrics/option lists by bumping version
+    keys; a per-process cache only sees the bumps made in its own process.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend.endswith("locmem.LocMemCache"):
+        return [
+            Warning(
+                "The default cache is LocMemCache, which is per process.",
+                hint=(
+                    "With several workers, cache invalidation in timetracking only reaches the "
+                    "writing process; others serve data up to timetracking.utils.VERSION_TTL "
+                    "seconds stale. Set CACHE_URL to a shared backend (Redis, Memcached, DB cache)."
+                ),
+                id="timetracking.W001",
+            )
+        ]
+    return []
@@ -1,7 +1,24 @@
+from typing import List, Tuple
+
 from django import forms
+from django.core.cache import cache
 from django.db import models
 from .models import TrackedProject, TrackedTask, TimeEntry
-from .utils import parse_duration_to_minutes
+from .utils import options_version, parse_duration_to_minutes
+
+# (id, title) pairs for the project <select>, under the options version that
+# every mirror change bumps.
+PROJECT_CHOICES_KEY = "tt:projects:all:{ver}"
+PROJECT_CHOICES_TTL = 300
+
+
+def project_choices() -> List[Tuple[int, str]]:
+    """All tracked projects as (id, title), ordered by title; cached under the options version."""
+    return cache.get_or_set(
+        PROJECT_CHOICES_KEY.format(ver=options_version()),
+        lambda: list(TrackedProject.objects.order_by("title").values_list("id", "title")),
+        PROJECT_CHOICES_TTL,
+    )
 
 
 class TimeEntryForm(forms.ModelForm):
@@ -27,6 +44,11 @@ class TimeEntryForm(forms.ModelForm):
 
         # Projects always ordered for usability
         self.fields["project"].queryset = TrackedProject.objects.order_by("title")
+        # Render from the cached pairs; the queryset is still what validates the POST.
+        # A callable is only evaluated when the <select> renders, so a submitted form
+        # that redirects never looks them up.
+        empty_label = self.fields["project"].empty_label
+        self.fields["project"].choices = lambda: [("", empty_label), *project_choices()]
 
         # Prepopulate duration when editing
         if getattr(self.instance, "pk", None) and not self.is_bound:
@@ -53,7 +75,8 @@ class TimeEntryForm(forms.ModelForm):
                 qs = TrackedTask.objects.filter(
                     models.Q(project_id=project_id) | models.Q(pk=self.instance.task_id)
                 ).order_by("title")
-            self.fields["task"].queryset = qs
+            # Option labels are str(task), which reads task.project.title.
+            self.fields["task"].queryset = qs.select_related("project")
         else:
             self.fields["task"].queryset = TrackedTask.objects.none()
 
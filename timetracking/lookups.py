@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from django.db import NotSupportedError
+from django.db.models import Lookup
+
+
+class FullTextSearch(Lookup):
+    """
+    `notes__search="+word* ..."`: MySQL/MariaDB MATCH ... AGAINST in boolean mode.
+    Needs a FULLTEXT index on exactly that column (migration 0007 adds one for
+    TimeEntry.notes); other backends have no equivalent here and refuse it.
+    """
+
+    lookup_name = "search"
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError("Full-text search is only available on MySQL/MariaDB.")
+
+    def as_mysql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"MATCH ({lhs}) AGAINST ({rhs} IN BOOLEAN MODE)", (*lhs_params, *rhs_params)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.11 on 2026-10-16 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trackedproject',
+            name='content_hash',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, help_text='Hash of the mirrored fields; lets re-syncs skip unchanged rows.', null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.11 on 2026-10-16 04:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0002_trackedproject_content_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timeentry',
+            name='tt_idx_entry_user_date',
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', 'work_date', 'project'], name='tt_idx_entry_user_date_proj'),
+        ),
+    ]
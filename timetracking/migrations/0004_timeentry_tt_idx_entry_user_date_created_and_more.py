@@ -0,0 +1,23 @@
+# Generated by Django 5.1.11 on 2026-10-16 04:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0003_remove_timeentry_tt_idx_entry_user_date_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', '-work_date', '-created_at'], name='tt_idx_entry_user_date_created'),
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', 'work_date', 'task'], name='tt_idx_entry_user_date_task'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.11 on 2026-10-16 04:13
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_periods(apps, schema_editor):
+    TimeEntry = apps.get_model("timetracking", "TimeEntry")
+    # One UPDATE per distinct work_date rather than per row.
+    for wd in TimeEntry.objects.values_list("work_date", flat=True).distinct().order_by():
+        TimeEntry.objects.filter(work_date=wd).update(
+            work_week=wd - timedelta(days=wd.weekday()),
+            work_month=wd.replace(day=1),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0004_timeentry_tt_idx_entry_user_date_created_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeentry',
+            name='work_month',
+            field=models.DateField(blank=True, editable=False, help_text="First day of the work_date's month.", null=True),
+        ),
+        migrations.AddField(
+            model_name='timeentry',
+            name='work_week',
+            field=models.DateField(blank=True, editable=False, help_text="Monday of the work_date's week.", null=True),
+        ),
+        migrations.RunPython(backfill_periods, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.11 on 2026-10-16 04:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0005_timeentry_work_month_timeentry_work_week'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', 'project', '-work_date'], name='tt_idx_entry_user_proj_date'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def add_notes_fulltext(apps, schema_editor):
+    # FULLTEXT is MySQL/MariaDB-only; other backends keep the LIKE search.
+    if schema_editor.connection.vendor != "mysql":
+        return
+    table = schema_editor.quote_name(apps.get_model("timetracking", "TimeEntry")._meta.db_table)
+    schema_editor.execute(f"CREATE FULLTEXT INDEX tt_ft_entry_notes ON {table} (notes)")
+
+
+def drop_notes_fulltext(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    table = schema_editor.quote_name(apps.get_model("timetracking", "TimeEntry")._meta.db_table)
+    schema_editor.execute(f"DROP INDEX tt_ft_entry_notes ON {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0006_timeentry_tt_idx_entry_user_proj_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_notes_fulltext, drop_notes_fulltext),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.11 on 2026-10-16 04:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetracking', '0007_timeentry_notes_fulltext'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['work_date', 'project'], name='tt_idx_entry_date_proj'),
+        ),
+    ]
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import uuid
-from typing import Any
+from datetime import date, timedelta
+from typing import Any, List, Optional, Tuple
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError, models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.functions import TruncMonth, TruncWeek
 from django.utils import timezone
 from django.utils.text import slugify
 
@@ -18,6 +21,33 @@ class TimestampedModel(models.Model):
         abstract = True
 
 
+def _split_mirror_collisions(
+    objs: List[Any], existing: Any, source_field: str, keys: List[Tuple[str, ...]]
+) -> Tuple[List[Any], List[Any]]:
+    """
+    Split mirror rows into (clean, colliding): a row collides when one of its
+    unique `keys` (tuples of attnames) is already held by a row mirrored from a
+    different source id. NULLs never collide.
+    """
+    taken = {}
+    for row in existing:
+        for key in keys:
+            value = tuple(row[f] for f in key)
+            if None not in value:
+                taken[key, value] = row[source_field]
+    clean, colliding = [], []
+    for o in objs:
+        src = getattr(o, source_field)
+        for key in keys:
+            value = tuple(getattr(o, f) for f in key)
+            if None not in value and taken.get((key, value), src) != src:
+                colliding.append(o)
+                break
+        else:
+            clean.append(o)
+    return clean, colliding
+
+
 class TrackedProject(TimestampedModel):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True, db_index=True)
 
@@ -43,6 +73,14 @@ class TrackedProject(TimestampedModel):
         help_text="Original projects.Project id (no FK).",
     )
 
+    content_hash = models.BigIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+        help_text="Hash of the mirrored fields; lets re-syncs skip unchanged rows.",
+    )
+
     class Meta:
         ordering = ["title"]
         indexes = [
@@ -53,6 +91,48 @@ class TrackedProject(TimestampedModel):
     def __str__(self) -> str:
         return self.title
 
+    @staticmethod
+    def compute_content_hash(title: str, external_ref: Optional[str], is_active: bool) -> int:
+        raw = f"{title}|{external_ref or ''}|{int(bool(is_active))}".encode()
+        return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big", signed=True)
+
+    @classmethod
+    def bulk_mirror(cls, objs: List["TrackedProject"]) -> None:
+        """
+        Upsert mirrors in one statement per batch, keyed on source_project_id: new
+        projects are inserted, existing mirrors get their mirrored fields refreshed.
+        Bypasses save(), so callers set slug and content_hash themselves.
+
+        MySQL's ON DUPLICATE KEY UPDATE fires on *any* unique key, so a row whose
+        slug or external_ref belongs to a different mirror would overwrite it.
+        Those rows are split off first and upserted one by one on
+        source_project_id; a new one gets a fresh slug, and a clashing
+        external_ref raises IntegrityError instead of clobbering the other row.
+        """
+        update_fields = ["title", "external_ref", "is_active", "content_hash"]
+        existing = cls.objects.filter(
+            models.Q(slug__in=[o.slug for o in objs])
+            | models.Q(external_ref__in=[o.external_ref for o in objs if o.external_ref is not None])
+        ).values("source_project_id", "slug", "external_ref")
+        objs, colliding = _split_mirror_collisions(
+            objs, existing, "source_project_id", [("slug",), ("external_ref",)]
+        )
+        cls.objects.bulk_create(
+            objs,
+            batch_size=500,
+            update_conflicts=True,
+            # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target.
+            unique_fields=["source_project_id"] if connection.features.supports_update_conflicts_with_target else None,
+            update_fields=update_fields,
+        )
+        for o in colliding:
+            defaults = {f: getattr(o, f) for f in update_fields}
+            cls.objects.update_or_create(
+                source_project_id=o.source_project_id,
+                defaults=defaults,
+                create_defaults={**defaults, "slug": ""},
+            )
+
     def _ensure_slug(self) -> None:
         if self.slug:
             return
@@ -62,7 +142,9 @@ class TrackedProject(TimestampedModel):
             cand = base if n == 1 else f"{base}-{n}"
             self.slug = cand
             try:
-                super().save(force_insert=self._state.adding)
+                # Savepoint per attempt, so a collision doesn't poison an outer atomic block.
+                with transaction.atomic():
+                    super().save(force_insert=self._state.adding)
                 return
             except IntegrityError:
                 # Unique collision; try the next suffix.
@@ -70,6 +152,9 @@ class TrackedProject(TimestampedModel):
         raise IntegrityError("Could not generate a unique slug for TrackedProject.")
 
     def save(self, *args: Any, **kwargs: Any) -> None:
+        self.content_hash = self.compute_content_hash(self.title, self.external_ref, self.is_active)
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "content_hash"}
         if not self.slug and self._state.adding:
             self._ensure_slug()
             return
@@ -116,6 +201,37 @@ class TrackedTask(TimestampedModel):
     def __str__(self) -> str:
         return f"{self.project.title} — {self.title}"
 
+    @classmethod
+    def bulk_mirror(cls, objs: List["TrackedTask"]) -> None:
+        """
+        Upsert mirrors in one statement per batch, keyed on source_task_id.
+        Bypasses save(), so callers set unique per-project slugs themselves.
+        Rows clashing with another mirror on (project, slug) or (project,
+        external_ref) go through a per-row upsert, as in TrackedProject.bulk_mirror().
+        """
+        update_fields = ["title", "is_active"]
+        existing = cls.objects.filter(project_id__in={o.project_id for o in objs}).filter(
+            models.Q(slug__in=[o.slug for o in objs])
+            | models.Q(external_ref__in=[o.external_ref for o in objs if o.external_ref is not None])
+        ).values("source_task_id", "project_id", "slug", "external_ref")
+        objs, colliding = _split_mirror_collisions(
+            objs, existing, "source_task_id", [("project_id", "slug"), ("project_id", "external_ref")]
+        )
+        cls.objects.bulk_create(
+            objs,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["source_task_id"] if connection.features.supports_update_conflicts_with_target else None,
+            update_fields=update_fields,
+        )
+        for o in colliding:
+            defaults = {f: getattr(o, f) for f in update_fields}
+            cls.objects.update_or_create(
+                source_task_id=o.source_task_id,
+                defaults=defaults,
+                create_defaults={**defaults, "project_id": o.project_id, "external_ref": o.external_ref, "slug": ""},
+            )
+
     def _ensure_slug(self) -> None:
         if self.slug:
             return
@@ -125,7 +241,8 @@ class TrackedTask(TimestampedModel):
             cand = base if n == 1 else f"{base}-{n}"
             self.slug = cand
             try:
-                super().save(force_insert=self._state.adding)
+                with transaction.atomic():
+                    super().save(force_insert=self._state.adding)
                 return
             except IntegrityError:
                 continue
@@ -138,6 +255,41 @@ class TrackedTask(TimestampedModel):
         super().save(*args, **kwargs)
 
 
+def entry_periods(work_date: date) -> Tuple[date, date]:
+    """(Monday of the week, first of the month) for a work date."""
+    return work_date - timedelta(days=work_date.weekday()), work_date.replace(day=1)
+
+
+class TimeEntryQuerySet(models.QuerySet):
+    """Keeps work_week/work_month in step when work_date changes in bulk."""
+
+    def update(self, **kwargs: Any) -> int:
+        if "work_date" in kwargs and not {"work_week", "work_month"} & kwargs.keys():
+            wd = kwargs["work_date"]
+            if hasattr(wd, "resolve_expression"):
+                # F()/expression: let the database derive the buckets in the same UPDATE.
+                kwargs["work_week"] = TruncWeek(wd, output_field=models.DateField())
+                kwargs["work_month"] = TruncMonth(wd, output_field=models.DateField())
+            else:
+                wd = self.model._meta.get_field("work_date").to_python(wd)
+                kwargs["work_date"] = wd
+                kwargs["work_week"], kwargs["work_month"] = entry_periods(wd)
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def bulk_update(self, objs: Any, fields: Any, batch_size: Optional[int] = None) -> int:
+        fields = list(fields)
+        if "work_date" in fields:
+            objs = list(objs)
+            for obj in objs:
+                obj.sync_periods()
+            fields += [f for f in ("work_week", "work_month") if f not in fields]
+        return super().bulk_update(objs, fields, batch_size=batch_size)
+
+    bulk_update.alters_data = True
+
+
 class TimeEntry(TimestampedModel):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True, db_index=True)
 
@@ -150,14 +302,24 @@ class TimeEntry(TimestampedModel):
     billable = models.BooleanField(default=False, db_index=True)
     notes = models.TextField(blank=True)
 
+    # Trend buckets, derived from work_date in save() so GROUP BY reads a plain column.
+    work_week = models.DateField(blank=True, null=True, editable=False, help_text="Monday of the work_date's week.")
+    work_month = models.DateField(blank=True, null=True, editable=False, help_text="First day of the work_date's month.")
+
+    objects = TimeEntryQuerySet.as_manager()
+
     class Meta:
         ordering = ["-work_date", "-created_at"]
         indexes = [
             models.Index(fields=["project", "work_date"], name="tt_idx_entry_project_date"),
             models.Index(fields=["task", "work_date"], name="tt_idx_entry_task_date"),
-            models.Index(fields=["user", "work_date"], name="tt_idx_entry_user_date"),
+            models.Index(fields=["user", "-work_date", "-created_at"], name="tt_idx_entry_user_date_created"),
+            models.Index(fields=["user", "work_date", "project"], name="tt_idx_entry_user_date_proj"),
+            models.Index(fields=["user", "work_date", "task"], name="tt_idx_entry_user_date_task"),
+            models.Index(fields=["user", "project", "-work_date"], name="tt_idx_entry_user_proj_date"),
             models.Index(fields=["billable", "work_date"], name="tt_idx_entry_billable_date"),
             models.Index(fields=["project", "task", "work_date"], name="tt_idx_entry_proj_task_date"),
+            models.Index(fields=["work_date", "project"], name="tt_idx_entry_date_proj"),
         ]
         constraints = [
             models.CheckConstraint(check=models.Q(duration_minutes__gt=0), name="tt_chk_positive_minutes"),
@@ -170,9 +332,18 @@ class TimeEntry(TimestampedModel):
         if self.task_id and self.project_id and self.task.project_id != self.project_id:
             raise ValidationError({"task": "Task does not belong to the selected project."})
 
+    def sync_periods(self) -> None:
+        """Derive work_week/work_month from work_date (save() calls this; bulk paths must too)."""
+        # Accept whatever the field does ("2025-03-05", datetime) before doing date math.
+        self.work_date = self._meta.get_field("work_date").to_python(self.work_date)
+        self.work_week, self.work_month = entry_periods(self.work_date)
+
     def save(self, *args: Any, **kwargs: Any) -> None:
         if self.task_id and (not self.project_id or self.task.project_id != self.project_id):
             self.project_id = self.task.project_id
+        self.sync_periods()
+        if kwargs.get("update_fields") is not None and "work_date" in kwargs["update_fields"]:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "work_week", "work_month"}
         super().save(*args, **kwargs)
 
     @property
@@ -1,24 +1,44 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Iterable, Mapping, Optional, Type
 
 from django.apps import apps as django_apps
 from django.db import IntegrityError, transaction
+from django.db.models import Model
+from django.utils.text import slugify
+
+from .utils import bump_options_version, bump_users_version
+
+
+_SOURCE_MODELS: Dict[str, Type[Model]] = {}
+
+
+def get_source_model(model_name: str) -> Type[Model]:
+    """Resolve projects.<model_name> once; later calls skip the app registry."""
+    model = _SOURCE_MODELS.get(model_name)
+    if model is None:
+        model = _SOURCE_MODELS[model_name] = django_apps.get_model("projects", model_name)
+    return model
 
 
 def _project_active_from_status(status: Optional[str]) -> bool:
     return status != "archived"
 
 
-@transaction.atomic
 def on_project_saved(sender, instance, **kwargs):
     from .models import TrackedProject
 
     is_active = _project_active_from_status(getattr(instance, "status", None))
+    ext = getattr(instance, "slug", None)
+    content_hash = TrackedProject.compute_content_hash(instance.title, ext, is_active)
+    # Re-saves usually change nothing we mirror; one indexed probe settles it.
+    if TrackedProject.objects.filter(source_project_id=instance.pk, content_hash=content_hash).exists():
+        return
+
     defaults = {
         "title": instance.title,
         "is_active": is_active,
-        "external_ref": getattr(instance, "slug", None),
+        "external_ref": ext,
     }
 
     try:
@@ -27,7 +47,10 @@ def on_project_saved(sender, instance, **kwargs):
             defaults=defaults,
         )
     except IntegrityError:
-        tp = TrackedProject.objects.select_for_update().get(source_project_id=instance.pk)
+        # Lost a create race; lock the winner's row. get_or_create() already
+        # guards its INSERT with a savepoint, so no outer one is needed here.
+        with transaction.atomic(savepoint=False):
+            tp = TrackedProject.objects.select_for_update().get(source_project_id=instance.pk)
         created = False
 
     if not created:
@@ -35,7 +58,6 @@ def on_project_saved(sender, instance, **kwargs):
         if tp.title != instance.title:
             tp.title = instance.title
             update_fields.append("title")
-        ext = getattr(instance, "slug", None)
         if tp.external_ref != ext:
             tp.external_ref = ext
             update_fields.append("external_ref")
@@ -43,26 +65,56 @@ def on_project_saved(sender, instance, **kwargs):
             tp.is_active = is_active
             update_fields.append("is_active")
 
-        if update_fields:
+        # A stale/missing hash still needs writing even if the fields match.
+        if update_fields or tp.content_hash != content_hash:
             tp.save(update_fields=update_fields)
 
 
-@transaction.atomic
+def bulk_mirror_projects(rows: Iterable[Mapping[str, Any]]) -> None:
+    """
+    Mirror many projects in one go (hydrating an empty mirror).
+    `rows` are projects.Project values() dicts with id/title/slug/status.
+    Projects that already have a mirror are updated in place.
+    """
+    from .models import TrackedProject
+
+    objs = []
+    for p in rows:
+        is_active = _project_active_from_status(p["status"])
+        objs.append(TrackedProject(
+            source_project_id=p["id"],
+            title=p["title"],
+            # bulk_create() skips save()/_ensure_slug(); the source slug is already unique.
+            slug=p["slug"],
+            external_ref=p["slug"],
+            is_active=is_active,
+            content_hash=TrackedProject.compute_content_hash(p["title"], p["slug"], is_active),
+        ))
+    TrackedProject.bulk_mirror(objs)
+    bump_options_version()
+
+
 def on_project_deleted(sender, instance, **kwargs):
     from .models import TrackedProject, TrackedTask
 
     qs = TrackedProject.objects.filter(source_project_id=instance.pk)
-    proj_id = qs.values_list("id", flat=True).first()
-    qs.update(is_active=False)
-    if proj_id:
-        TrackedTask.objects.filter(project_id=proj_id).update(is_active=False)
+    with transaction.atomic(savepoint=False):
+        # Subquery rather than a join, so MySQL runs this as a single UPDATE
+        # instead of pre-selecting the task ids.
+        TrackedTask.objects.filter(project_id__in=qs.values("id")).update(is_active=False)
+        qs.update(is_active=False, content_hash=None)
+    bump_options_version()
 
 
-@transaction.atomic
 def on_task_saved(sender, instance, **kwargs):
+    with transaction.atomic(savepoint=False):
+        _mirror_task(instance)
+
+
+def _mirror_task(instance) -> None:
     from .models import TrackedProject, TrackedTask
 
-    Project = django_apps.get_model("projects", "Project")
+    Project = get_source_model("Project")
 
     parent_project = getattr(instance, "project", None)
     if parent_project is None and hasattr(instance, "project_id"):
@@ -114,8 +166,62 @@ def on_task_saved(sender, instance, **kwargs):
             tt.save(update_fields=update_fields)
 
 
-@transaction.atomic
+def bulk_mirror_tasks(tracked_project, rows: Iterable[Mapping[str, Any]], project_status: Optional[str]) -> None:
+    """
+    Mirror many tasks of one project in one go.
+    `rows` are projects.Task values() dicts with id/title.
+    Tasks that already have a mirror are updated in place.
+    """
+    from .models import TrackedTask
+
+    is_active = _project_active_from_status(project_status)
+
+    # Slugs are unique per project; dedupe here since bulk_create() skips _ensure_slug().
+    used = set(TrackedTask.objects.filter(project=tracked_project).values_list("slug", flat=True))
+    objs = []
+    for t in rows:
+        base = (slugify(t["title"]) or "task")[:180]
+        slug, n = base, 1
+        while slug in used:
+            n += 1
+            slug = f"{base}-{n}"
+        used.add(slug)
+        objs.append(TrackedTask(
+            project=tracked_project,
+            source_task_id=t["id"],
+            title=t["title"],
+            slug=slug,
+            external_ref=str(t["id"]),
+            is_active=is_active,
+        ))
+    TrackedTask.bulk_mirror(objs)
+    bump_options_version()
+
+
 def on_task_deleted(sender, instance, **kwargs):
     from .models import TrackedTask
 
     TrackedTask.objects.filter(source_task_id=instance.pk).update(is_active=False)
+    bump_options_version()
+
+
+def on_mirror_changed(sender, instance, **kwargs):
+    # Saves/deletes of TrackedProject/TrackedTask; update()/bulk paths bump explicitly.
+    bump_options_version()
+
+
+def on_entry_changed(sender, instance, **kwargs):
+    from .utils import bump_entries_version
+
+    bump_entries_version(instance.user_id)
+
+
+# Name fields the metrics display; saves touching only others (e.g. last_login on
+# every login) leave the cached names valid.
+_USER_NAME_FIELDS = frozenset({"username", "first_name", "last_name"})
+
+
+def on_user_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not _USER_NAME_FIELDS.intersection(update_fields):
+        return
+    bump_users_version()
@@ -0,0 +1,205 @@
+from datetime import date, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F, Q, Sum
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from projects.models import Project, Task
+
+from .models import TimeEntry, TrackedProject, TrackedTask
+from .views import MetricsBase, _decode_cursor, _encode_cursor
+
+
+class TimeTrackingTestCase(TestCase):
+    """Two mirrored projects with tasks and a few weeks of entries for a PM and a member."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.pm = User.objects.create_user("alice", password="pw", first_name="Al", last_name="Ice")
+        cls.pm.profile.role = "pm"
+        cls.pm.profile.save()
+        cls.member = User.objects.create_user("bob", password="pw")
+
+        alpha = Project.objects.create(title="Alpha", created_by=cls.pm, status="active")
+        beta = Project.objects.create(title="Beta", created_by=cls.pm, status="active")
+        col_a = alpha.boards.get(board_type="tasks").columns.first()
+        col_b = beta.boards.get(board_type="tasks").columns.first()
+        design = Task.objects.create(project=alpha, title="Design", column=col_a, created_by=cls.pm)
+        build = Task.objects.create(project=alpha, title="Build", column=col_a, created_by=cls.pm)
+        ship = Task.objects.create(project=beta, title="Ship", column=col_b, created_by=cls.pm)
+
+        cls.alpha = TrackedProject.objects.get(source_project_id=alpha.pk)
+        cls.beta = TrackedProject.objects.get(source_project_id=beta.pk)
+        tasks = [TrackedTask.objects.get(source_task_id=t.pk) for t in (design, build, ship)]
+
+        cls.today = date.today()
+        for i in range(60):
+            task = tasks[i % 3]
+            TimeEntry.objects.create(
+                project=task.project, task=task, user=cls.pm if i % 3 else cls.member,
+                work_date=cls.today - timedelta(days=i % 20), duration_minutes=15 + i,
+                billable=bool(i % 2), notes=f"note {i}",
+            )
+        cls.range = {"from": str(cls.today - timedelta(days=30)), "to": str(cls.today), "user": "all"}
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.pm)
+
+    def url(self, name, *args):
+        return reverse(f"timetracking:{name}", args=args)
+
+
+class QueryCountTests(TimeTrackingTestCase):
+    """
+    Pin the query budget of the hot views (session + user lookups included), and
+    check it doesn't grow with more projects, tasks, users and entries.
+    """
+
+    def grow(self):
+        """Add a project with two tasks and a new user's entries on every task."""
+        user = User.objects.create_user(f"extra{User.objects.count()}", password="pw")
+        project = Project.objects.create(title=f"Extra {user.pk}", created_by=self.pm, status="active")
+        col = project.boards.get(board_type="tasks").columns.first()
+        for title in ("One", "Two"):
+            Task.objects.create(project=project, title=title, column=col, created_by=self.pm)
+        for i, task in enumerate(TrackedTask.objects.select_related("project")):
+            for who in (user, self.pm):
+                TimeEntry.objects.create(
+                    project=task.project, task=task, user=who,
+                    work_date=self.today - timedelta(days=i % 10), duration_minutes=10 + i,
+                )
+        cache.clear()
+
+    def assertNumQueriesAtScale(self, num, request):
+        for _ in range(2):
+            with self.assertNumQueries(num):
+                self.assertEqual(request().status_code, 200)
+            self.grow()
+
+    def test_metrics_bundle(self):
+        self.assertNumQueriesAtScale(7, lambda: self.client.get(self.url("metrics_bundle"), self.range))
+
+    def test_metrics_summary(self):
+        self.assertNumQueriesAtScale(6, lambda: self.client.get(self.url("metrics_summary"), self.range))
+
+    def test_metrics_tables(self):
+        for kind in ("projects", "tasks", "users", "upt"):
+            cache.clear()
+            with self.subTest(kind=kind), self.assertNumQueries(5):
+                self.assertEqual(self.client.get(self.url("metrics_table", kind), self.range).status_code, 200)
+
+    def test_metrics_trend(self):
+        for interval in ("day", "week", "month"):
+            cache.clear()
+            with self.subTest(interval=interval), self.assertNumQueries(4):
+                r = self.client.get(self.url("metrics_trend"), {**self.range, "interval": interval})
+                self.assertEqual(r.status_code, 200)
+
+    def test_entries_fragment(self):
+        self.assertNumQueriesAtScale(3, lambda: self.client.get(self.url("entries_fragment")))
+
+    def test_entries_rows(self):
+        row = TimeEntry.objects.filter(user=self.pm).values("id", "work_date", "created_at").first()
+        with self.assertNumQueries(3):
+            r = self.client.get(self.url("entries_rows"), {"cursor": _encode_cursor(row)})
+            self.assertEqual(r.status_code, 200)
+
+    # The manifest only exists after collectstatic; admin templates need {% static %}.
+    @override_settings(STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    })
+    def test_admin_changelist(self):
+        admin = User.objects.create_superuser("root", "root@example.com", "pw")
+        self.client.force_login(admin)
+        self.assertNumQueriesAtScale(10, lambda: self.client.get(reverse("admin:timetracking_timeentry_changelist")))
+
+
+class CursorTests(TimeTrackingTestCase):
+    def test_round_trip(self):
+        row = TimeEntry.objects.values("id", "work_date", "created_at").first()
+        self.assertEqual(_decode_cursor(_encode_cursor(row)), (row["work_date"], row["created_at"], row["id"]))
+
+    def test_rows_walk_every_entry_once(self):
+        r = self.client.get(self.url("entries_fragment"))
+        seen = [e["id"] for e in r.context["entries"]]
+        while r.context["more_url"]:
+            r = self.client.get(r.context["more_url"])
+            self.assertEqual(r.status_code, 200)
+            seen += [e["id"] for e in r.context["entries"]]
+        self.assertEqual(seen, list(TimeEntry.objects.filter(user=self.pm).values_list("id", flat=True)))
+
+    def test_malformed_cursor_is_400(self):
+        for bad in ("not-base64!", "Zm9v", ""):
+            with self.subTest(cursor=bad):
+                self.assertEqual(self.client.get(self.url("entries_rows"), {"cursor": bad}).status_code, 400)
+
+
+class MetricsETagTests(TimeTrackingTestCase):
+    def revalidate(self):
+        url = self.url("metrics_summary")
+        etag = self.client.get(url, self.range)["ETag"]
+        self.assertEqual(self.client.get(url, self.range, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        return lambda: self.client.get(url, self.range, HTTP_IF_NONE_MATCH=etag).status_code
+
+    def test_entry_save_invalidates(self):
+        status = self.revalidate()
+        entry = TimeEntry.objects.filter(user=self.member).first()
+        entry.duration_minutes += 30
+        entry.save()
+        self.assertEqual(status(), 200)
+
+    def test_user_rename_invalidates(self):
+        status = self.revalidate()
+        self.member.first_name = "Robert"
+        self.member.save()
+        self.assertEqual(status(), 200)
+
+
+class MetricsTotalsTests(TimeTrackingTestCase):
+    def test_totals_match_database(self):
+        request = RequestFactory().get("/", self.range)
+        request.user = self.pm
+        totals = {
+            (r["project_id"], r["task_id"]): (r["minutes"], r["billable"], r["entries"])
+            for r in MetricsBase().project_task_totals(request)
+        }
+        reference = {
+            (r["project_id"], r["task_id"]): (r["minutes"], r["billable"] or 0, r["entries"])
+            for r in TimeEntry.objects
+            .filter(work_date__range=(self.range["from"], self.range["to"]))
+            .values("project_id", "task_id")
+            .annotate(
+                minutes=Sum("duration_minutes"),
+                billable=Sum("duration_minutes", filter=Q(billable=True)),
+                entries=Count("id"),
+            )
+        }
+        self.assertEqual(totals, reference)
+
+
+class TimeEntryPeriodTests(TimeTrackingTestCase):
+    def test_string_work_date(self):
+        entry = TimeEntry.objects.create(
+            project=self.alpha, task=self.alpha.tasks.first(), user=self.pm,
+            duration_minutes=30, work_date="2025-03-05",
+        )
+        self.assertEqual((entry.work_week, entry.work_month), (date(2025, 3, 3), date(2025, 3, 1)))
+
+    def test_queryset_update_recomputes_periods(self):
+        qs = TimeEntry.objects.filter(pk=TimeEntry.objects.first().pk)
+        qs.update(work_date="2025-04-10")
+        self.assertEqual(qs.values_list("work_week", "work_month").get(), (date(2025, 4, 7), date(2025, 4, 1)))
+        qs.update(work_date=F("work_date"))
+        self.assertEqual(qs.values_list("work_week", "work_month").get(), (date(2025, 4, 7), date(2025, 4, 1)))
+
+
+@skipUnless(connection.vendor == "mysql", "FULLTEXT search is MySQL-only")
+class FullTextSearchTests(TimeTrackingTestCase):
+    def test_notes_search(self):
+        self.assertTrue(TimeEntry.objects.filter(notes__search="+note*").exists())
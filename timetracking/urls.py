@@ -3,7 +3,7 @@ from .views import (
     TimeEntryView, EntriesFragmentView, EntryEditView,
     ProjectOptionsView, TaskOptionsView,
     EntriesRowsView,
-    MetricsHomeView, MetricsSummaryView, MetricsTableView, MetricsTrendView,
+    MetricsHomeView, MetricsSummaryView, MetricsTableView, MetricsTrendView, MetricsBundleView,
 )
 
 app_name = "timetracking"
@@ -20,4 +20,5 @@ urlpatterns = [
     path("time/metrics/summary/", MetricsSummaryView.as_view(), name="metrics_summary"),
     path("time/metrics/table/<str:kind>/", MetricsTableView.as_view(), name="metrics_table"),
     path("time/metrics/trend/", MetricsTrendView.as_view(), name="metrics_trend"),
+    path("time/metrics/bundle/", MetricsBundleView.as_view(), name="metrics_bundle"),
 ]
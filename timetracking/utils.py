@@ -1,5 +1,20 @@
 from __future__ import annotations
 
+import uuid
+from typing import Iterable, List, Optional
+
+from django.core.cache import cache
+
+ENTRIES_VERSION_KEY = "tt:entries:ver:{user_id}"
+OPTIONS_VERSION_KEY = "tt:opts:ver"
+USERS_VERSION_KEY = "tt:users:ver"
+# Version keys only invalidate within the cache that holds them. With a shared
+# backend (Redis, Memcached, DB cache) a bump reaches every worker at once; with
+# the per-process LocMemCache it reaches only the writing process, so the keys
+# expire after VERSION_TTL: other workers mint a fresh version (a full miss) and
+# serve data at most that stale.
+VERSION_TTL = 60
+
 def parse_duration_to_minutes(text: str) -> int:
     """
     Parse duration into minutes.
@@ -39,4 +54,65 @@ def parse_duration_to_minutes(text: str) -> int:
         return int(s[:-1] or "0")
 
     # Plain minutes "90"
-    return int(s)
\ No newline at end of file
+    return int(s)
+
+
+def bulk_create_entries(entries: Iterable, batch_size: int = 500) -> List:
+    """
+    Bulk insert TimeEntry rows, aligning each entry's project with its task
+    and filling the work_week/work_month buckets.
+    TimeEntry.save() does that alignment per instance (one task lookup per
+    entry); here it is resolved for all tasks in a single query instead.
+    bulk_create() skips save() and signals, so callers get no per-row hooks.
+    """
+    from .models import TimeEntry, TrackedTask
+
+    entries = list(entries)
+    task_ids = {e.task_id for e in entries if e.task_id}
+    project_for_task = dict(
+        TrackedTask.objects.filter(pk__in=task_ids).values_list("id", "project_id")
+    )
+    for e in entries:
+        if e.task_id in project_for_task:
+            e.project_id = project_for_task[e.task_id]
+        e.sync_periods()
+    created = TimeEntry.objects.bulk_create(entries, batch_size=batch_size)
+    # bulk_create() sends no post_save, so invalidate per-user caches here.
+    for user_id in {e.user_id for e in created}:
+        bump_entries_version(user_id)
+    return created
+
+
+def entries_version(user_id: Optional[int]) -> str:
+    """
+    Current cache version for a user's time entries (user_id=None: anyone's).
+    Cache keys derived from those entries embed it, so bumping the version
+    invalidates them all.
+    """
+    key = ENTRIES_VERSION_KEY.format(user_id="all" if user_id is None else user_id)
+    return cache.get_or_set(key, lambda: uuid.uuid4().hex, VERSION_TTL)
+
+
+def bump_entries_version(user_id: int) -> None:
+    cache.set_many({
+        ENTRIES_VERSION_KEY.format(user_id=user_id): uuid.uuid4().hex,
+        ENTRIES_VERSION_KEY.format(user_id="all"): uuid.uuid4().hex,
+    }, VERSION_TTL)
+
+
+def options_version() -> str:
+    """Cache version for the rendered project/task option lists (any mirror change bumps it)."""
+    return cache.get_or_set(OPTIONS_VERSION_KEY, lambda: uuid.uuid4().hex, VERSION_TTL)
+
+
+def bump_options_version() -> None:
+    cache.set(OPTIONS_VERSION_KEY, uuid.uuid4().hex, VERSION_TTL)
+
+
+def users_version() -> str:
+    """Cache version for user display names shown in the metrics (any name change bumps it)."""
+    return cache.get_or_set(USERS_VERSION_KEY, lambda: uuid.uuid4().hex, VERSION_TTL)
+
+
+def bump_users_version() -> None:
+    cache.set(USERS_VERSION_KEY, uuid.uuid4().hex, VERSION_TTL)
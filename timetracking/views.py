@@ -1,25 +1,60 @@
 from __future__ import annotations
-from typing import Any, Dict, Iterable, List, Optional, Tuple
-from datetime import date, timedelta
+import base64
+import binascii
+import hashlib
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from urllib.parse import urlencode
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.http import HttpResponse, HttpResponseBadRequest
-from django.db import models, transaction
-from django.apps import apps as django_apps
-from django.db.models import Case, When, IntegerField, Q, Count, Min, Max, Sum
-from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
-from django.views.decorators.http import require_GET
+from django.db import connection, models, transaction
+from django.db.models import CharField, F, Q, Count, Min, Max, Sum, Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim, TruncMonth, TruncWeek
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 from django.utils.decorators import method_decorator
+from django.utils.html import escape
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.views import View
-from django.core.paginator import Paginator, EmptyPage
 
-from .forms import TimeEntryForm
+from .forms import TimeEntryForm, project_choices
 from .models import TimeEntry, TrackedProject, TrackedTask
+from .utils import entries_version, options_version, users_version
 
 RESULT_LIMIT = 50
+PROJECTS_HYDRATED_KEY = "tt:projects_hydrated"
+TASKS_HYDRATED_KEY = "tt:tasks_hydrated:{pid}"
+# Hydrated flags expire rather than live forever: on a per-process cache another
+# worker's state is invisible, and a lapsed flag costs one exists() probe.
+HYDRATED_TTL = 300
+# Rendered <option> lists per (kind, project, q): typeahead repeats the same
+# queries within seconds, and the mirrors are the same for every user. Keys embed
+# the options version, which any mirror change bumps; the short TTL bounds what a
+# worker that missed the bump (per-process cache) can serve.
+OPTIONS_CACHE_KEY = "tt:opts:{ver}:{kind}:{pid}:{digest}"
+OPTIONS_CACHE_TTL = 60
+
+def _user_role_ctx(request) -> Dict[str, Any]:
+    """User/role display bits shared by the time-entry and metrics pages, memoized on the request."""
+    ctx = getattr(request, "_tt_role_ctx", None)
+    if ctx is None:
+        profile = getattr(request.user, "profile", None)
+        ctx = request._tt_role_ctx = {
+            "user_display_name": request.user.get_full_name() or request.user.get_username(),
+            "user_role": getattr(profile, "role", None),
+            "user_role_display": profile.get_role_display() if profile else "—",
+            "is_pm": bool(getattr(profile, "is_project_manager", False)),
+            "is_dev": bool(getattr(profile, "is_developer", False)),
+        }
+    return ctx
 
 class TimeEntryView(LoginRequiredMixin, View):
     template_name = "timetracking/home.html"
@@ -33,42 +68,37 @@ class TimeEntryView(LoginRequiredMixin, View):
             return None
 
     def get_context(self, request, form: TimeEntryForm, selected_project_id: Optional[int]) -> Dict[str, Any]:
+        # Join + only() keeps the related columns to id/title in a single query;
+        # Prefetch() with trimmed querysets would ship the same bytes in three.
         recent_entries = (
             TimeEntry.objects.filter(user=request.user)
             .select_related("project", "task")
+            .only(
+                "id", "work_date", "created_at", "duration_minutes", "billable", "notes",
+                "project__title", "task__title",
+            )
             .order_by("-work_date", "-created_at")[: self.max_recent]
         )
 
-        # ---- Role/user display bits ----
-        profile = getattr(request.user, "profile", None)
-        role_code = getattr(profile, "role", None)
-        role_display = profile.get_role_display() if profile else "—"
-        is_pm = bool(getattr(profile, "is_project_manager", False))
-        is_dev = bool(getattr(profile, "is_developer", False))
-
-        user_display_name = request.user.get_full_name() or request.user.get_username()
-
+        role_ctx = _user_role_ctx(request)
         return {
             "form": form,
             "recent_entries": recent_entries,
             "selected_project_id": selected_project_id,
             # expose to template
-            "user_display_name": user_display_name,
-            "user_role": role_code,
-            "user_role_display": role_display,
-            "is_pm": is_pm,
-            "is_dev": is_dev,
+            **role_ctx,
             # convenience for the metrics button
-            "can_view_metrics": is_pm,
+            "can_view_metrics": role_ctx["is_pm"],
         }
 
     def get(self, request, *args, **kwargs):
         selected_project_id = self._selected_project_id(request)
         initial = {}
         if selected_project_id:
-            try:
-                initial["project"] = TrackedProject.objects.only("id").get(id=selected_project_id)
-            except TrackedProject.DoesNotExist:
+            # Checked against the cached dropdown pairs the form renders anyway.
+            if any(pid == selected_project_id for pid, _ in project_choices()):
+                initial["project"] = selected_project_id
+            else:
                 selected_project_id = None
 
         form = TimeEntryForm(initial=initial)
@@ -95,13 +125,44 @@ class TimeEntryView(LoginRequiredMixin, View):
 
         return render(request, self.template_name, self.get_context(request, form, selected_project_id))
 
+def _fulltext_terms(q: str) -> Optional[str]:
+    """
+    Boolean-mode MATCH query requiring every word of `q` as a word prefix
+    ("+word*"), or None when a word is under the default 3-character
+    FULLTEXT token size and would be silently ignored.
+    """
+    words = re.findall(r"\w+", q)
+    if not words or any(len(w) < 3 for w in words):
+        return None
+    return " ".join(f"+{w}*" for w in words)
+
+def _encode_cursor(row: Dict[str, Any]) -> str:
+    """Opaque 'Load more' cursor for the (work_date, created_at, id) position of `row`."""
+    raw = f"{row['work_date'].isoformat()}|{row['created_at'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[date, datetime, int]:
+    """Inverse of _encode_cursor(); raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    wd, ca, pk = raw.split("|")
+    return date.fromisoformat(wd), datetime.fromisoformat(ca), int(pk)
+
+
 class EntriesBase(LoginRequiredMixin, View):
     per_page_default = 25
+    per_page_max = 200
+    # Columns the entry rows render; fetched as values() dicts, not model instances.
+    row_fields = (
+        "id", "work_date", "created_at", "duration_minutes", "billable", "notes",
+        "project__title", "task__title",
+    )
 
     def _filtered_qs(self, request):
-        qs = (TimeEntry.objects
-              .filter(user=request.user)
-              .select_related("project", "task"))
+        # Rows are read with values(*row_fields), which joins just the two titles.
+        qs = TimeEntry.objects.filter(user=request.user)
         q = (request.GET.get("q") or "").strip()
         proj = request.GET.get("project")
         dt_from = request.GET.get("from")
@@ -114,50 +175,93 @@ class EntriesBase(LoginRequiredMixin, View):
         if dt_to:
             qs = qs.filter(work_date__lte=dt_to)
         if q:
+            # Match titles on the small project/task tables and filter entries by id
+            # (IN subqueries on indexed FKs). Notes use the FULLTEXT index when every
+            # search word is long enough to be indexed, else a LIKE over the user's rows.
+            terms = _fulltext_terms(q) if connection.vendor == "mysql" else None
             qs = qs.filter(
-                models.Q(project__title__icontains=q) |
-                models.Q(task__title__icontains=q) |
-                models.Q(notes__icontains=q)
+                models.Q(project_id__in=TrackedProject.objects.filter(title__icontains=q).values("id")) |
+                models.Q(task_id__in=TrackedTask.objects.filter(title__icontains=q).values("id")) |
+                (models.Q(notes__search=terms) if terms else models.Q(notes__icontains=q))
             )
 
-        qs = qs.order_by("-work_date", "-created_at")
+        qs = qs.order_by("-work_date", "-created_at", "-id")
         return qs, {"q": q, "project_id": proj, "dt_from": dt_from, "dt_to": dt_to}
 
+    def _more_url(self, params: Dict[str, Any], last: Dict[str, Any], per_page: int) -> str:
+        """'Load more' URL: same filters plus a cursor positioned after `last`."""
+        query = {
+            "q": params["q"],
+            "project": params["project_id"],
+            "from": params["dt_from"],
+            "to": params["dt_to"],
+            "per": per_page,
+            "cursor": _encode_cursor(last),
+        }
+        return f"{reverse('timetracking:entries_rows')}?{urlencode({k: v for k, v in query.items() if v})}"
+
+    def _page(self, request, qs, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One keyset page: rows strictly after ?cursor= in (-work_date, -created_at, -id)
+        order, a seek on the (user, work_date, created_at) index rather than an OFFSET.
+        Fetches per_page + 1 rows so the extra one tells whether a 'Load more' follows.
+        Raises ValueError for a malformed cursor (and nothing else).
+        """
+        # Clamped: ?per=0 would leave no row to build the cursor from.
+        per_page = min(max(_safe_int(request.GET.get("per"), self.per_page_default), 1), self.per_page_max)
+        cursor = request.GET.get("cursor")
+        if cursor:
+            wd, ca, pk = _decode_cursor(cursor)
+            qs = qs.filter(
+                Q(work_date__lt=wd) |
+                Q(work_date=wd, created_at__lt=ca) |
+                Q(work_date=wd, created_at=ca, id__lt=pk)
+            )
+        entries = list(qs.values(*self.row_fields)[: per_page + 1])
+        more_url = None
+        if len(entries) > per_page:
+            entries = entries[:per_page]
+            more_url = self._more_url(params, entries[-1], per_page)
+        return entries, more_url
+
 class EntriesFragmentView(EntriesBase):
     """Full panel with first page and a 'Load more' button."""
     template_name = "timetracking/partials/entries_panel.html"
 
     def get(self, request, *args, **kwargs):
         qs, params = self._filtered_qs(request)
-        per_page = int(request.GET.get("per") or self.per_page_default)
-        paginator = Paginator(qs, per_page)
         try:
-            page_obj = paginator.page(int(request.GET.get("page") or 1))
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+            entries, more_url = self._page(request, qs, params)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid cursor.")
 
         ctx = {
-            "entries": page_obj.object_list,
-            "page_obj": page_obj,
-            "paginator": paginator,
+            "entries": entries,
+            "more_url": more_url,
             **params,
         }
         return render(request, self.template_name, ctx)
 
 class EntriesRowsView(EntriesBase):
-    """Returns only <tr> rows for appending when clicking 'Load more'."""
+    """
+    Returns only <tr> rows for appending when clicking 'Load more'.
+    Keyset-paginated: a seek past ?cursor=, no COUNT/OFFSET.
+    """
     template_name = "timetracking/partials/entries_rows.html"
 
     def get(self, request, *args, **kwargs):
-        qs, _ = self._filtered_qs(request)
-        per_page = int(request.GET.get("per") or self.per_page_default)
-        paginator = Paginator(qs, per_page)
+        qs, params = self._filtered_qs(request)
+        if not request.GET.get("cursor"):
+            return HttpResponseBadRequest("Invalid cursor.")
         try:
-            page_obj = paginator.page(int(request.GET.get("page") or 1))
-        except EmptyPage:
+            entries, more_url = self._page(request, qs, params)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid cursor.")
+        if not entries:
             # nothing more to load; return empty body
             return HttpResponse("")
-        return render(request, self.template_name, {"entries": page_obj.object_list})
+
+        return render(request, self.template_name, {"entries": entries, "more_url": more_url})
 
 
 class EntryEditView(LoginRequiredMixin, View):
@@ -168,25 +272,20 @@ class EntryEditView(LoginRequiredMixin, View):
     template_name = "timetracking/partials/entry_edit_form.html"
 
     def _get_entry(self, request, pk: int) -> TimeEntry:
-        entry = get_object_or_404(TimeEntry.objects.select_related("project", "task"), pk=pk)
         # Basic rule: users can edit their own entries; expand later with PM overrides if desired.
-        if entry.user_id != request.user.id and not request.user.is_superuser:
-            raise PermissionError("Not allowed.")
-        return entry
+        # Scoped in the query, so someone else's entry is a plain 404.
+        qs = TimeEntry.objects.filter(pk=pk)
+        if not request.user.is_superuser:
+            qs = qs.filter(user_id=request.user.id)
+        return get_object_or_404(qs.select_related("project", "task"))
 
     def get(self, request, pk: int, *args, **kwargs):
-        try:
-            entry = self._get_entry(request, pk)
-        except PermissionError:
-            return HttpResponseBadRequest("Not allowed.")
+        entry = self._get_entry(request, pk)
         form = TimeEntryForm(instance=entry)
         return render(request, self.template_name, {"form": form, "entry": entry})
 
     def post(self, request, pk: int, *args, **kwargs):
-        try:
-            entry = self._get_entry(request, pk)
-        except PermissionError:
-            return HttpResponseBadRequest("Not allowed.")
+        entry = self._get_entry(request, pk)
 
         form = TimeEntryForm(request.POST, instance=entry)
         if form.is_valid():
@@ -196,44 +295,89 @@ class EntryEditView(LoginRequiredMixin, View):
             return resp
         return render(request, self.template_name, {"form": form, "entry": entry}, status=400)
 
+def _ranked_options(qs, q: str) -> List[Dict[str, Any]]:
+    """
+    Active first, then title-prefix / slug-prefix matches, then title; capped at RESULT_LIMIT.
+    The DB returns a bounded (is_active, title)-ordered window and the prefix rank is
+    applied here; the sort is stable, so title order within a rank is the DB's.
+    """
+    rows = list(
+        qs.order_by("-is_active", "title")
+          .values("id", "title", "slug", "is_active")[: RESULT_LIMIT * 4]
+    )
+    if q:
+        q_l = q.lower()
+        rows.sort(key=lambda r: (
+            not r["is_active"],
+            0 if r["title"].lower().startswith(q_l) else 1 if r["slug"].lower().startswith(q_l) else 2,
+        ))
+    return rows[:RESULT_LIMIT]
+
+def _search_options(qs, q: str) -> List[Dict[str, Any]]:
+    """
+    Autocomplete input is nearly always a prefix, and active title-prefix matches
+    rank first. For q of 2+ characters fetch those alone: an ordered range scan on
+    the (is_active, title) / (project, title) indexes, with no ranking needed.
+    Only when they can't fill the list does the icontains scan run, ranked, for
+    the remaining slots.
+    """
+    if not q:
+        return _ranked_options(qs, q)
+    rows: List[Dict[str, Any]] = []
+    if len(q) >= 2:
+        rows = list(
+            qs.filter(is_active=True, title__istartswith=q)
+              .order_by("title")
+              .values("id", "title", "slug", "is_active")[:RESULT_LIMIT]
+        )
+        if len(rows) >= RESULT_LIMIT:
+            return rows
+    rest = qs.filter(
+        Q(title__icontains=q) |
+        Q(slug__icontains=q) |
+        Q(external_ref__icontains=q)
+    )
+    if rows:
+        rest = rest.exclude(id__in=[r["id"] for r in rows])
+    return rows + _ranked_options(rest, q)[: RESULT_LIMIT - len(rows)]
+
+def _render_options(rows: Iterable[Mapping[str, Any]], placeholder: str) -> str:
+    """<option> list for the typeahead selects; plain string joins, no template engine per keystroke."""
+    return "".join([
+        f'<option value="">{placeholder}</option>',
+        *(
+            f'<option value="{r["id"]}">{escape(r["title"])}{"" if r["is_active"] else " (inactive)"}</option>'
+            for r in rows
+        ),
+    ])
+
 @method_decorator(require_GET, name="dispatch")
 class ProjectOptionsView(LoginRequiredMixin, View):
     """
     Returns <option> list for the Project <select>, filtered by ?q=...
     If no TrackedProject rows exist yet, lazily hydrate from projects.Project.
     """
-    template_name = "timetracking/partials/project_options.html"
-
     def get(self, request, *args, **kwargs):
         q = (request.GET.get("q") or "").strip()
 
-        # Lazy hydrate once if mirror is empty
-        if not TrackedProject.objects.exists():
-            Project = django_apps.get_model("projects", "Project")
-            from .signals import on_project_saved
-            with transaction.atomic():
-                for p in Project.objects.all().only("id", "title", "slug", "status"):
-                    on_project_saved(Project, p)
-
-        qs = TrackedProject.objects.all()
-        if q:
-            qs = qs.filter(
-                Q(title__icontains=q) |
-                Q(slug__icontains=q) |
-                Q(external_ref__icontains=q)
-            )
-
-        qs = qs.annotate(
-            active_rank=Case(When(is_active=True, then=0), default=1, output_field=IntegerField()),
-            prefix_rank=Case(
-                When(title__istartswith=q, then=0) if q else When(pk__isnull=False, then=1),
-                When(slug__istartswith=q, then=1) if q else When(pk__isnull=False, then=1),
-                default=2,
-                output_field=IntegerField(),
+        # Lazy hydrate if the mirror is empty. The signals keep the mirror in sync
+        # afterwards, so the flag spares keystrokes the exists() probe.
+        if not cache.get(PROJECTS_HYDRATED_KEY):
+            if not TrackedProject.objects.exists():
+                from .signals import bulk_mirror_projects, get_source_model
+                Project = get_source_model("Project")
+                with transaction.atomic():
+                    bulk_mirror_projects(Project.objects.values("id", "title", "slug", "status"))
+            cache.set(PROJECTS_HYDRATED_KEY, True, HYDRATED_TTL)
+
+        html = cache.get_or_set(
+            OPTIONS_CACHE_KEY.format(
+                ver=options_version(), kind="projects", pid="", digest=hashlib.md5(q.encode()).hexdigest(),
             ),
-        ).order_by("active_rank", "prefix_rank", "title")[:RESULT_LIMIT]
-
-        return render(request, self.template_name, {"projects": qs})
+            lambda: _render_options(_search_options(TrackedProject.objects.all(), q), "— Select a project —"),
+            OPTIONS_CACHE_TTL,
+        )
+        return HttpResponse(html)
 
 
 @method_decorator(require_GET, name="dispatch")
@@ -242,8 +386,6 @@ class TaskOptionsView(LoginRequiredMixin, View):
     Returns <option> list for the Task <select>, filtered by ?q=... and scoped to ?project=<id>.
     Lazily hydrates TrackedTask for the chosen tracked project if none exist yet.
     """
-    template_name = "timetracking/partials/task_options.html"
-
     def get(self, request, *args, **kwargs):
         project_id = request.GET.get("project")
         if not project_id or not project_id.isdigit():
@@ -254,41 +396,49 @@ class TaskOptionsView(LoginRequiredMixin, View):
 
         qs = TrackedTask.objects.filter(project_id=pid)
 
-        # Lazy hydrate if this tracked project has no mirrored tasks yet
-        if not qs.exists():
-            tp = TrackedProject.objects.filter(id=pid).only("id", "source_project_id").first()
-            if tp and tp.source_project_id:
-                Project = django_apps.get_model("projects", "Project")
-                Task = django_apps.get_model("projects", "Task")
-                from .signals import on_project_saved, on_task_saved
-                parent = Project.objects.filter(pk=tp.source_project_id).first()
-                if parent:
-                    with transaction.atomic():
-                        # Ensure project mirror up to date
-                        on_project_saved(Project, parent)
-                        # Mirror all tasks for that project
-                        for t in Task.objects.filter(project_id=parent.pk).only("id", "title", "project_id"):
-                            on_task_saved(Task, t)
-                    qs = TrackedTask.objects.filter(project_id=pid)
-
-        if q:
-            qs = qs.filter(
-                Q(title__icontains=q) |
-                Q(slug__icontains=q) |
-                Q(external_ref__icontains=q)
+        def cache_key() -> str:
+            return OPTIONS_CACHE_KEY.format(
+                ver=options_version(), kind="tasks", pid=pid, digest=hashlib.md5(q.encode()).hexdigest(),
             )
 
-        qs = qs.annotate(
-            active_rank=Case(When(is_active=True, then=0), default=1, output_field=IntegerField()),
-            prefix_rank=Case(
-                When(title__istartswith=q, then=0) if q else When(pk__isnull=False, then=1),
-                When(slug__istartswith=q, then=1) if q else When(pk__isnull=False, then=1),
-                default=2,
-                output_field=IntegerField(),
-            ),
-        ).order_by("active_rank", "prefix_rank", "title")[:RESULT_LIMIT]
-
-        return render(request, self.template_name, {"tasks": qs})
+        html = cache.get(cache_key())
+        if html is None:
+            tasks = _search_options(qs, q)
+            # No exists() probe up front: only an empty result can mean the project
+            # was never hydrated. A search that matches nothing in a mirrored project
+            # doesn't, hence the unfiltered probe; the flag caches the outcome.
+            hydrated_key = TASKS_HYDRATED_KEY.format(pid=pid)
+            if not tasks and not cache.get(hydrated_key):
+                mirrored = bool(q) and qs.exists()
+                if not mirrored and self._hydrate(pid):
+                    tasks = _search_options(qs, q)
+                cache.set(hydrated_key, True, HYDRATED_TTL)
+            html = _render_options(tasks, "— Select a task —")
+            # Hydrating bumps the options version, so build the key again.
+            cache.set(cache_key(), html, OPTIONS_CACHE_TTL)
+        return HttpResponse(html)
+
+    def _hydrate(self, pid: int) -> bool:
+        """Mirror all source tasks of tracked project `pid`; False if it has no source project."""
+        tp = TrackedProject.objects.filter(id=pid).only("id", "source_project_id").first()
+        if not tp or not tp.source_project_id:
+            return False
+        from .signals import bulk_mirror_tasks, get_source_model, on_project_saved
+        Project = get_source_model("Project")
+        Task = get_source_model("Task")
+        parent = Project.objects.filter(pk=tp.source_project_id).first()
+        if not parent:
+            return False
+        with transaction.atomic():
+            # Ensure project mirror up to date
+            on_project_saved(Project, parent)
+            # Mirror all tasks for that project
+            bulk_mirror_tasks(
+                tp,
+                Task.objects.filter(project_id=parent.pk).values("id", "title"),
+                project_status=parent.status,
+            )
+        return True
 
 # ------------------------------
 # Metrics helpers
@@ -311,31 +461,158 @@ def _fmt_hours(minutes: Optional[int]) -> float:
 def _percent(n: int, d: int) -> float:
     return round((n / d) * 100.0, 1) if d else 0.0
 
-def _normalize_series(values: List[int]) -> List[int]:
+def _normalize_series(values: List[int], peak: Optional[int] = None) -> List[int]:
+    """Scale `values` to 0..100 of their peak; pass `peak` when the caller already tracked it."""
     if not values:
         return []
-    m = max(values)
+    m = max(values) if peak is None else peak
     if m <= 0:
-        return [0 for _ in values]
-    return [int(round((v / m) * 100)) for v in values]
+        return [0] * len(values)
+    # Integer round-half-up: no per-element float division/round() calls.
+    half = m // 2
+    return [(v * 100 + half) // m for v in values]
+
+def _top_project_and_task(pairs: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Pick the top project and top task by minutes from per-(project, task) totals."""
+    if not pairs:
+        return None, None
+    top_task = max(pairs, key=lambda r: r["minutes"] or 0)
+    per_project: Dict[int, Dict[str, Any]] = {}
+    for r in pairs:
+        p = per_project.setdefault(
+            r["project_id"],
+            {"project_id": r["project_id"], "project__title": r["project__title"], "minutes": 0},
+        )
+        p["minutes"] += r["minutes"] or 0
+    top_project = max(per_project.values(), key=lambda p: p["minutes"])
+    return top_project, top_task
+
+# Trend buckets: ?interval= -> (bucket expression, label formatter). Week/month read
+# the stored columns and fall back to truncating work_date for rows written before
+# (or around) sync_periods(). Labels use isoformat() (C, no format-string parsing)
+# wherever it fits.
+_TREND_BUCKETS = MappingProxyType({
+    "day": (F("work_date"), date.isoformat),                     # "%Y-%m-%d"
+    "month": (
+        Coalesce("work_month", TruncMonth("work_date"), output_field=models.DateField()),
+        lambda d: d.isoformat()[:7],                             # "%Y-%m"
+    ),
+    "week": (
+        Coalesce("work_week", TruncWeek("work_date"), output_field=models.DateField()),
+        lambda d: d.strftime("%Y-W%W"),
+    ),
+})
+
+# Table sorting: ?sort= key -> field of the derived rows, which every table sorts in Python.
+_PROJECT_SORT_FIELDS = MappingProxyType({
+    "hours": "minutes", "billable": "billable", "entries": "entries",
+    "first": "first", "last": "last", "project": "label",
+})
+_TASK_SORT_FIELDS = MappingProxyType({
+    "hours": "minutes", "billable": "billable", "entries": "entries",
+    "first": "first", "last": "last", "task": "label", "project": "project",
+})
+_USER_SORT_FIELDS = MappingProxyType({
+    "hours": "minutes", "billable": "billable", "entries": "entries",
+    "projects": "projects", "tasks": "tasks", "first": "first", "last": "last",
+    "user": "order",
+})
+_UPT_SORT_FIELDS = MappingProxyType({
+    "hours": "minutes", "billable": "billable", "entries": "entries",
+    "first": "first", "last": "last", "user": "order", "project": "project", "task": "task",
+})
+
+def _next_sort(key: str, current: str) -> str:
+    """Sort value a column header links to: toggles asc/desc, descending first."""
+    if current == key:
+        return f"-{key}"
+    if current == f"-{key}":
+        return key
+    return f"-{key}"
+
+def _sort_dir(key: str, current: str) -> Optional[str]:
+    if current == key:
+        return "asc"
+    if current == f"-{key}":
+        return "desc"
+    return None
+
+# Column keys of each table, in header order.
+_TABLE_KEYS = MappingProxyType({
+    "projects": ("project", "hours", "billable", "entries", "tasks", "first", "last"),
+    "tasks": ("task", "project", "hours", "billable", "entries", "first", "last"),
+    "users": ("user", "hours", "billable", "entries", "projects", "tasks", "first", "last"),
+    "upt": ("user", "project", "task", "hours", "billable", "entries", "first", "last"),
+})
+
+@lru_cache(maxsize=128)
+def _sort_ui(kind: str, sort: str) -> Tuple[Dict[str, Optional[str]], Dict[str, str], Dict[str, str]]:
+    """
+    Header sort state for a table: (dir, suffix, next) per column key. Depends only
+    on (kind, sort), so it is memoized; callers must treat the dicts as read-only.
+    """
+    keys = _TABLE_KEYS[kind]
+    sort_dir = {k: _sort_dir(k, sort) for k in keys}                       # "asc" | "desc" | None
+    sort_suffix = {k: (f" ({v})" if v else "") for k, v in sort_dir.items()}
+    sort_next = {k: _next_sort(k, sort) for k in keys}
+    return sort_dir, sort_suffix, sort_next
+
+@lru_cache(maxsize=64)
+def _top_options(kind: str, top: int) -> Tuple[Dict[str, Any], ...]:
+    """Options of a table's "Top N" select; memoized like _sort_ui(), so read-only."""
+    selected = top or (50 if kind == "upt" else 20)
+    return tuple(
+        {"value": n, "label": f"Top {n}", "selected": n == selected}
+        for n in (10, 20, 50, 100, 200)
+    )
+
+def _sort_rows(rows: List[Dict[str, Any]], sort: str, fields: Mapping[str, str], tiebreak) -> None:
+    """
+    In-place sort of derived table rows, mirroring the SQL ordering they replace:
+    `sort` is "key" / "-key", unknown keys fall back to -minutes; ties keep `tiebreak` order.
+    """
+    field = fields.get(sort.lstrip("-"))
+    desc = sort.startswith("-")
+    if field is None:
+        field, desc = "minutes", True
+    rows.sort(key=tiebreak)
+    if field in ("label", "project", "task"):
+        rows.sort(key=lambda r: r[field].casefold(), reverse=desc)
+    else:
+        rows.sort(key=lambda r: r[field], reverse=desc)
+
+def _user_label_expr(prefix: str = ""):
+    """Display name computed in SQL: trimmed "First Last", else the username. `prefix` is the path to the user."""
+    full = Trim(Concat(
+        Trim(f"{prefix}first_name"), Value(" "), Trim(f"{prefix}last_name"), output_field=CharField(),
+    ))
+    return Coalesce(NullIf(full, Value("")), f"{prefix}username", output_field=CharField())
 
 def _can_view_all(request) -> bool:
-    profile = getattr(request.user, "profile", None)
-    return bool(getattr(profile, "is_project_manager", False)) or bool(getattr(request.user, "is_superuser", False))
+    # Memoized on the request: params parsing and user scoping each ask.
+    allowed = getattr(request, "_tt_can_view_all", None)
+    if allowed is None:
+        allowed = request._tt_can_view_all = (
+            _user_role_ctx(request)["is_pm"] or bool(getattr(request.user, "is_superuser", False))
+        )
+    return allowed
 
-def _apply_user_scope(qs, request, user_mode: str, selected_user_id: Optional[int]):
+def _scope_user_id(request, user_mode: str, selected_user_id: Optional[int]) -> Optional[int]:
     """
     user_mode: 'me' | 'one' | 'all'
+    Returns the user id the metrics are scoped to, or None for all users.
     If 'all' is not allowed, silently fall back to 'me'.
     """
     if user_mode == "all":
-        if not _can_view_all(request):
-            return qs.filter(user=request.user)
-        return qs
+        return None if _can_view_all(request) else request.user.id
     if user_mode == "one" and selected_user_id:
-        return qs.filter(user_id=selected_user_id)
+        return selected_user_id
     # default 'me'
-    return qs.filter(user=request.user)
+    return request.user.id
+
+def _apply_user_scope(qs, request, user_mode: str, selected_user_id: Optional[int]):
+    uid = _scope_user_id(request, user_mode, selected_user_id)
+    return qs if uid is None else qs.filter(user_id=uid)
 
 # ------------------------------
 # Metrics views
@@ -347,6 +624,13 @@ class MetricsBase(LoginRequiredMixin, View):
     """
 
     def parse_params(self, request):
+        # Memoized on the request: filtered_qs() and the views both need it.
+        params = getattr(request, "_tt_params", None)
+        if params is None:
+            params = request._tt_params = self._parse_params(request)
+        return params
+
+    def _parse_params(self, request):
         # Core filters
         pid = _safe_int(request.GET.get("project"))
         d_from = (request.GET.get("from") or "").strip()
@@ -398,8 +682,8 @@ class MetricsBase(LoginRequiredMixin, View):
             user_mode, selected_user_id, _
         ) = self.parse_params(request)
 
-        qs = TimeEntry.objects.select_related("project", "task")
-        qs = _apply_user_scope(qs, request, user_mode, selected_user_id)
+        # Consumers only aggregate via values(), which joins what it references.
+        qs = _apply_user_scope(TimeEntry.objects.all(), request, user_mode, selected_user_id)
         if pid:
             qs = qs.filter(project_id=pid)
         if d_from:
@@ -412,33 +696,114 @@ class MetricsBase(LoginRequiredMixin, View):
             qs = qs.filter(billable=False)
         return qs
 
+    def has_entries(self, request) -> bool:
+        """EXISTS probe on the filtered entries (memoized on the request) to skip aggregates on empty ranges."""
+        found = getattr(request, "_tt_has_entries", None)
+        if found is None:
+            found = request._tt_has_entries = self.filtered_qs(request).exists()
+        return found
+
+    def fragment_cache_key(self, request, name: str) -> str:
+        """
+        Cache key for a fragment's data: scope user, its entries version, the options
+        and users versions (fragments carry project/task titles and user names) and
+        the parsed filters.
+        """
+        params = self.parse_params(request)
+        *_, user_mode, selected_user_id, _ = params
+        uid = _scope_user_id(request, user_mode, selected_user_id)
+        digest = hashlib.md5(repr(params).encode()).hexdigest()
+        return f"tt:metrics:{name}:{uid or 'all'}:{entries_version(uid)}:{options_version()}:{users_version()}:{digest}"
+
+    def entry_totals(self, request) -> List[Dict[str, Any]]:
+        """
+        Per-(user, project, task) totals for the current filters: the one grouped
+        scan behind the summary and all four tables. Every panel rolls it up in
+        Python, and the dashboard's requests share it through the cache.
+        """
+        def _compute():
+            if not self.has_entries(request):
+                return []
+            totals = list(
+                self.filtered_qs(request)
+                .values("user_id", "project_id", "project__title", "task_id", "task__title")
+                .annotate(
+                    minutes=Sum("duration_minutes"),
+                    billable=Sum("duration_minutes", filter=Q(billable=True)),
+                    entries=Count("id"),
+                    first=Min("work_date"),
+                    last=Max("work_date"),
+                )
+            )
+            # Names come from one keyed fetch of the few users involved rather than
+            # a user join (and wider GROUP BY) across every matching entry.
+            users = {
+                u["id"]: u
+                for u in get_user_model().objects
+                .filter(id__in={r["user_id"] for r in totals})
+                .values("id", "first_name", "last_name", "username", label=_user_label_expr())
+            }
+            for r in totals:
+                u = users[r["user_id"]]
+                r["user__first_name"] = u["first_name"]
+                r["user__last_name"] = u["last_name"]
+                r["user__username"] = u["username"]
+                r["user_label"] = u["label"]
+            return totals
+        return cache.get_or_set(self.fragment_cache_key(request, "upt"), _compute, 30)
+
+    def project_task_totals(self, request) -> List[Dict[str, Any]]:
+        """Per-(project, task) totals, rolled up from entry_totals()."""
+        per_pair: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for r in self.entry_totals(request):
+            t = per_pair.get((r["project_id"], r["task_id"]))
+            if t is None:
+                per_pair[(r["project_id"], r["task_id"])] = {
+                    "project_id": r["project_id"], "project__title": r["project__title"],
+                    "task_id": r["task_id"], "task__title": r["task__title"],
+                    "minutes": r["minutes"] or 0, "billable": r["billable"] or 0,
+                    "entries": r["entries"], "first": r["first"], "last": r["last"],
+                }
+                continue
+            t["minutes"] += r["minutes"] or 0
+            t["billable"] += r["billable"] or 0
+            t["entries"] += r["entries"]
+            t["first"] = min(t["first"], r["first"])
+            t["last"] = max(t["last"], r["last"])
+        return list(per_pair.values())
+
     def _projects_for_filter(self, request, d_from: str, d_to: str, user_mode: str, selected_user_id: Optional[int]) -> List[Dict[str, Any]]:
-        qs = TimeEntry.objects.filter(work_date__gte=d_from, work_date__lte=d_to)
-        qs = _apply_user_scope(qs, request, user_mode, selected_user_id)
-        rows = (
-            qs.values("project_id", "project__title")
-              .annotate(total=Sum("duration_minutes"))
-              .order_by("project__title")
-        )
-        return [{"id": r["project_id"], "title": r["project__title"]} for r in rows]
+        # Changes only when the scoped entries or the project titles do: cache it under both versions.
+        uid = _scope_user_id(request, user_mode, selected_user_id)
+        key = f"tt:metrics:projfilt:{uid or 'all'}:{entries_version(uid)}:{options_version()}:{d_from}:{d_to}"
+        projects = cache.get(key)
+        if projects is None:
+            qs = TimeEntry.objects.filter(work_date__gte=d_from, work_date__lte=d_to)
+            if uid is not None:
+                qs = qs.filter(user_id=uid)
+            # Only "which projects have activity" matters here: an IN (subquery) on the
+            # (user, work_date, project) index, no GROUP BY/SUM over the entries.
+            projects = list(
+                TrackedProject.objects.filter(id__in=qs.values("project_id"))
+                .order_by("title")
+                .values("id", "title")
+            )
+            cache.set(key, projects, 300)
+        return projects
 
     def _users_for_filter(self, request, d_from: str, d_to: str, pid: Optional[int]) -> List[Dict[str, Any]]:
         User = get_user_model()
-        base = TimeEntry.objects.filter(work_date__gte=d_from, work_date__lte=d_to)
+        # One JOIN from users to their entries; the conditions go in a single
+        # filter() so they all apply to the same joined entry.
+        entry_filter = {"time_entries__work_date__gte": d_from, "time_entries__work_date__lte": d_to}
         if pid:
-            base = base.filter(project_id=pid)
-        user_ids = list(base.values_list("user_id", flat=True).distinct())
-        if not user_ids:
-            return []
-        users = (
-            User.objects.filter(id__in=user_ids)
-            .values("id", "first_name", "last_name", "username")
+            entry_filter["time_entries__project_id"] = pid
+        return list(
+            User.objects.filter(**entry_filter)
+            .distinct()
+            .values("id", name=_user_label_expr())
             .order_by("first_name", "last_name", "username")
         )
-        def _name(u):
-            full = f"{u.get('first_name','').strip()} {u.get('last_name','').strip()}".strip()
-            return full or u.get("username") or f"User {u['id']}"
-        return [{"id": u["id"], "name": _name(u)} for u in users]
 
 
 class MetricsHomeView(MetricsBase):
@@ -462,13 +827,7 @@ class MetricsHomeView(MetricsBase):
         um_me = (user_mode == "me")
         um_all = (user_mode == "all")
 
-        # ---- user/role context (same pattern as TimeEntryView) ----
-        profile = getattr(request.user, "profile", None)
-        role_code = getattr(profile, "role", None)
-        role_display = profile.get_role_display() if profile else "—"
-        is_pm = bool(getattr(profile, "is_project_manager", False))
-        is_dev = bool(getattr(profile, "is_developer", False))
-        user_display_name = request.user.get_full_name() or request.user.get_username()
+        role_ctx = _user_role_ctx(request)  # same bits as TimeEntryView
 
         ctx = {
             "projects": projects,
@@ -489,282 +848,243 @@ class MetricsHomeView(MetricsBase):
             "um_all": um_all,
 
             # expose to template
-            "user_display_name": user_display_name,
-            "user_role": role_code,
-            "user_role_display": role_display,
-            "is_pm": is_pm,
-            "is_dev": is_dev,
-            "can_manage_metrics": is_pm,
+            **role_ctx,
+            "can_manage_metrics": role_ctx["is_pm"],
         }
         return render(request, self.template_name, ctx)
 
+def _metrics_etag(request, *args, **kwargs) -> str:
+    """
+    ETag for a metrics fragment: the fragment cache key (data versions and parsed
+    filters) plus the full path for per-view controls, and the count/latest
+    updated_at of the filtered entries. The versions live in the cache, which may
+    be per-process; the aggregate makes an edit served by another worker change
+    the tag too. Its count also answers has_entries() for the render.
+    """
+    view = MetricsBase()
+    key = view.fragment_cache_key(request, request.get_full_path())
+    stamp = view.filtered_qs(request).aggregate(n=Count("id"), m=Max("updated_at"))
+    request._tt_has_entries = bool(stamp["n"])
+    return hashlib.md5(f"{key}:{stamp['n']}:{stamp['m']}".encode()).hexdigest()
+
+# Dashboard polls revalidate (no-cache) and get a 304 while nothing changed.
+_METRICS_CONDITIONAL = [cache_control(private=True, no_cache=True), condition(etag_func=_metrics_etag)]
+
+
+@method_decorator(_METRICS_CONDITIONAL, name="get")
 class MetricsSummaryView(MetricsBase):
     template_name = "timetracking/metrics/_summary.html"
 
     def get(self, request, *args, **kwargs):
-        qs = self.filtered_qs(request)
-
-        agg = qs.aggregate(
-            total=Sum("duration_minutes"),
-            billable=Sum("duration_minutes", filter=Q(billable=True)),
-            entries=Count("id"),
-            first=Min("work_date"),
-            last=Max("work_date"),
-            days_active=Count("work_date", distinct=True),
+        return render(request, *self.fragment(request))
+
+    def fragment(self, request) -> Tuple[str, Dict[str, Any]]:
+        # Short TTL: the dashboard re-requests this on every filter change.
+        ctx = cache.get_or_set(
+            self.fragment_cache_key(request, "summary"),
+            lambda: self.summarize(request),
+            30,
         )
-        total = agg["total"] or 0
-        bill = agg["billable"] or 0
+        return self.template_name, ctx
+
+    def summarize(self, request) -> Dict[str, Any]:
+        # Totals and both "top" tiles come from the (project, task) totals shared with
+        # the tables; only the distinct-day count needs its own query.
+        pairs = self.project_task_totals(request)
+        total = sum(r["minutes"] or 0 for r in pairs)
+        bill = sum(r["billable"] or 0 for r in pairs)
+        entries = sum(r["entries"] for r in pairs)
+        first = min((r["first"] for r in pairs), default=None)
+        last = max((r["last"] for r in pairs), default=None)
+        days = self.filtered_qs(request).values("work_date").distinct().count() if pairs else 0
+
         nonbill = total - bill
         util = _percent(bill, total)
-        avg_day = _fmt_hours(total) / (agg["days_active"] or 1)
-
-        top_project = (
-            qs.values("project_id", "project__title")
-              .annotate(mins=Sum("duration_minutes"))
-              .order_by("-mins")
-              .first()
-        )
-        top_task = (
-            qs.values("task_id", "task__title", "project__title")
-              .annotate(mins=Sum("duration_minutes"))
-              .order_by("-mins")
-              .first()
-        )
+        avg_day = _fmt_hours(total) / (days or 1)
+        top_project, top_task = _top_project_and_task(pairs)
 
-        ctx = {
+        return {
             "k_total_hours": _fmt_hours(total),
             "k_billable_hours": _fmt_hours(bill),
             "k_nonbillable_hours": _fmt_hours(nonbill),
             "k_util": util,
-            "k_entries": agg["entries"] or 0,
-            "k_days": agg["days_active"] or 0,
+            "k_entries": entries,
+            "k_days": days,
             "k_avg_day": round(avg_day, 2),
-            "first_date": agg["first"],
-            "last_date": agg["last"],
+            "first_date": first,
+            "last_date": last,
             "top_project": top_project,
             "top_task": top_task,
         }
-        return render(request, self.template_name, ctx)
 
 
+@method_decorator(_METRICS_CONDITIONAL, name="get")
 class MetricsTableView(MetricsBase):
     def get(self, request, kind: str, *args, **kwargs):
         if kind not in ("projects", "tasks", "users", "upt"):
             return HttpResponseBadRequest("Invalid table kind.")
+        return render(request, *self.fragment(request, kind))
 
-        qs = self.filtered_qs(request)
-
+    def fragment(self, request, kind: str) -> Tuple[str, Dict[str, Any]]:
         # Local table controls
         q = (request.GET.get("q") or "").strip()
         top = _safe_int(request.GET.get("top"), 20)
         sort = (request.GET.get("sort") or "-hours").strip()  # "-hours", "billable", etc.
 
-        # Simple search
-        if q:
-            if kind == "projects":
-                qs = qs.filter(project__title__icontains=q)
-            elif kind == "tasks":
-                qs = qs.filter(Q(task__title__icontains=q) | Q(project__title__icontains=q))
-            elif kind == "users":
-                qs = qs.filter(
-                    Q(user__first_name__icontains=q) |
-                    Q(user__last_name__icontains=q) |
-                    Q(user__username__icontains=q)
-                )
-            else:  # "upt" (user-project-task)
-                qs = qs.filter(
-                    Q(user__first_name__icontains=q) |
-                    Q(user__last_name__icontains=q) |
-                    Q(user__username__icontains=q) |
-                    Q(project__title__icontains=q) |
-                    Q(task__title__icontains=q)
-                )
-
-        # sort helpers
-        def next_sort_for(key: str, current: str) -> str:
-            if current == key:
-                return f"-{key}"
-            if current == f"-{key}":
-                return key
-            return f"-{key}"
-
-        def dir_for(key: str, current: str) -> Optional[str]:
-            if current == key:
-                return "asc"
-            if current == f"-{key}":
-                return "desc"
-            return None
+        # Dashboards re-poll with the same filters: cache the finished rows per
+        # table controls, on top of the shared totals they are built from.
+        controls = hashlib.md5(repr((q, top, sort)).encode()).hexdigest()
+        return cache.get_or_set(
+            self.fragment_cache_key(request, f"table:{kind}:{controls}"),
+            lambda: self.build(request, kind, q, top, sort),
+            30,
+        )
 
+    def build(self, request, kind: str, q: str, top: int, sort: str) -> Tuple[str, Dict[str, Any]]:
+        # Every table is derived from the shared totals, and the search is a
+        # casefolded substring match over their names/titles.
+        ql = q.casefold()
         if kind == "projects":
-            rows_qs = (
-                qs.values("project_id", "project__title")
-                  .annotate(
-                      minutes=Sum("duration_minutes"),
-                      billable=Sum("duration_minutes", filter=Q(billable=True)),
-                      entries=Count("id"),
-                      tasks=Count("task", distinct=True),
-                      first=Min("work_date"),
-                      last=Max("work_date"),
-                  )
+            # Rolled up from the shared (project, task) totals; "tasks" is the number of pairs.
+            per_project: Dict[int, Dict[str, Any]] = {}
+            for r in self.project_task_totals(request):
+                if ql and ql not in r["project__title"].casefold():
+                    continue
+                p = per_project.get(r["project_id"])
+                if p is None:
+                    p = per_project[r["project_id"]] = {
+                        "id": r["project_id"], "label": r["project__title"],
+                        "minutes": 0, "billable": 0, "entries": 0, "tasks": 0,
+                        "first": r["first"], "last": r["last"],
+                    }
+                p["minutes"] += r["minutes"] or 0
+                p["billable"] += r["billable"] or 0
+                p["entries"] += r["entries"]
+                p["tasks"] += 1
+                p["first"] = min(p["first"], r["first"])
+                p["last"] = max(p["last"], r["last"])
+            agg_rows = list(per_project.values())
+            _sort_rows(
+                agg_rows, sort,
+                _PROJECT_SORT_FIELDS,
+                tiebreak=lambda r: r["label"].casefold(),
             )
-            order_map = {
-                "hours": "minutes", "-hours": "-minutes",
-                "billable": "billable", "-billable": "-billable",
-                "entries": "entries", "-entries": "-entries",
-                "first": "first", "-first": "-first",
-                "last": "last", "-last": "-last",
-                "project": "project__title", "-project": "-project__title",
-            }
-            rows_qs = rows_qs.order_by(order_map.get(sort, "-minutes"), "project__title")[: top or 20]
             rows = [{
-                "id": r["project_id"],
-                "label": r["project__title"],
-                "hours": _fmt_hours(r["minutes"] or 0),
-                "billable": _fmt_hours(r["billable"] or 0),
-                "entries": r["entries"] or 0,
-                "tasks": r["tasks"] or 0,
+                "id": r["id"],
+                "label": r["label"],
+                "hours": _fmt_hours(r["minutes"]),
+                "billable": _fmt_hours(r["billable"]),
+                "entries": r["entries"],
+                "tasks": r["tasks"],
                 "first": r["first"],
                 "last": r["last"],
-            } for r in rows_qs]
-            keys = ["project", "hours", "billable", "entries", "tasks", "first", "last"]
+            } for r in agg_rows[: top or 20]]
             title = "By Project"
             template = "timetracking/metrics/_table_projects.html"
 
         elif kind == "tasks":
-            rows_qs = (
-                qs.values("task_id", "task__title", "project__title", "project_id")
-                  .annotate(
-                      minutes=Sum("duration_minutes"),
-                      billable=Sum("duration_minutes", filter=Q(billable=True)),
-                      entries=Count("id"),
-                      first=Min("work_date"),
-                      last=Max("work_date"),
-                  )
+            agg_rows = [
+                {
+                    "label": r["task__title"], "project": r["project__title"], "project_id": r["project_id"],
+                    "minutes": r["minutes"] or 0, "billable": r["billable"] or 0, "entries": r["entries"],
+                    "first": r["first"], "last": r["last"],
+                }
+                for r in self.project_task_totals(request)
+                if not ql or ql in r["task__title"].casefold() or ql in r["project__title"].casefold()
+            ]
+            _sort_rows(
+                agg_rows, sort,
+                _TASK_SORT_FIELDS,
+                tiebreak=lambda r: (r["project"].casefold(), r["label"].casefold()),
             )
-            order_map = {
-                "hours": "minutes", "-hours": "-minutes",
-                "billable": "billable", "-billable": "-billable",
-                "entries": "entries", "-entries": "-entries",
-                "first": "first", "-first": "-first",
-                "last": "last", "-last": "-last",
-                "task": "task__title", "-task": "-task__title",
-                "project": "project__title", "-project": "-project__title",
-            }
-            rows_qs = rows_qs.order_by(order_map.get(sort, "-minutes"), "project__title", "task__title")[: top or 20]
             rows = [{
-                "label": r["task__title"],
-                "project": r["project__title"],
+                "label": r["label"],
+                "project": r["project"],
                 "project_id": r["project_id"],
-                "hours": _fmt_hours(r["minutes"] or 0),
-                "billable": _fmt_hours(r["billable"] or 0),
-                "entries": r["entries"] or 0,
+                "hours": _fmt_hours(r["minutes"]),
+                "billable": _fmt_hours(r["billable"]),
+                "entries": r["entries"],
                 "first": r["first"],
                 "last": r["last"],
-            } for r in rows_qs]
-            keys = ["task", "project", "hours", "billable", "entries", "first", "last"]
+            } for r in agg_rows[: top or 20]]
             title = "By Task"
             template = "timetracking/metrics/_table_tasks.html"
 
         elif kind == "users":
-            rows_qs = (
-                qs.values("user_id", "user__first_name", "user__last_name", "user__username")
-                  .annotate(
-                      minutes=Sum("duration_minutes"),
-                      billable=Sum("duration_minutes", filter=Q(billable=True)),
-                      entries=Count("id"),
-                      projects=Count("project", distinct=True),
-                      tasks=Count("task", distinct=True),
-                      first=Min("work_date"),
-                      last=Max("work_date"),
-                  )
-            )
-            order_map = {
-                "hours": "minutes", "-hours": "-minutes",
-                "billable": "billable", "-billable": "-billable",
-                "entries": "entries", "-entries": "-entries",
-                "projects": "projects", "-projects": "-projects",
-                "tasks": "tasks", "-tasks": "-tasks",
-                "first": "first", "-first": "-first",
-                "last": "last", "-last": "-last",
-                "user": "user__first_name", "-user": "-user__first_name",
-            }
-            rows_qs = rows_qs.order_by(order_map.get(sort, "-minutes"),
-                                       "user__first_name", "user__last_name", "user__username")[: top or 20]
-            def _name(r):
-                full = f"{(r.get('user__first_name') or '').strip()} {(r.get('user__last_name') or '').strip()}".strip()
-                return full or r.get("user__username") or f"User {r['user_id']}"
+            # Rolled up from the (user, project, task) totals: each row is one distinct
+            # task (a task belongs to one project), no COUNT(DISTINCT ...) needed.
+            per_user: Dict[int, Dict[str, Any]] = {}
+            for r in self.entry_totals(request):
+                u = per_user.get(r["user_id"])
+                if u is None:
+                    names = (r["user__first_name"] or "", r["user__last_name"] or "", r["user__username"] or "")
+                    u = per_user[r["user_id"]] = {
+                        "label": r["user_label"],
+                        "order": tuple(n.casefold() for n in names),
+                        "minutes": 0, "billable": 0, "entries": 0,
+                        "projects": set(), "tasks": 0,
+                        "first": r["first"], "last": r["last"],
+                    }
+                u["minutes"] += r["minutes"] or 0
+                u["billable"] += r["billable"] or 0
+                u["entries"] += r["entries"]
+                u["projects"].add(r["project_id"])
+                u["tasks"] += 1
+                u["first"] = min(u["first"], r["first"])
+                u["last"] = max(u["last"], r["last"])
+            agg_rows = [u for u in per_user.values() if not ql or any(ql in n for n in u["order"])]
+            for u in agg_rows:
+                u["projects"] = len(u["projects"])
+            _sort_rows(agg_rows, sort, _USER_SORT_FIELDS, tiebreak=lambda r: r["order"])
             rows = [{
-                "user": _name(r),
-                "hours": _fmt_hours(r["minutes"] or 0),
-                "billable": _fmt_hours(r["billable"] or 0),
-                "entries": r["entries"] or 0,
-                "projects": r["projects"] or 0,
-                "tasks": r["tasks"] or 0,
+                "user": r["label"],
+                "hours": _fmt_hours(r["minutes"]),
+                "billable": _fmt_hours(r["billable"]),
+                "entries": r["entries"],
+                "projects": r["projects"],
+                "tasks": r["tasks"],
                 "first": r["first"],
                 "last": r["last"],
-            } for r in rows_qs]
-            keys = ["user", "hours", "billable", "entries", "projects", "tasks", "first", "last"]
+            } for r in agg_rows[: top or 20]]
             title = "By User"
             template = "timetracking/metrics/_table_users.html"
 
         else:  # kind == "upt" (User × Project × Task)
-            rows_qs = (
-                qs.values(
-                    "user_id", "user__first_name", "user__last_name", "user__username",
-                    "project_id", "project__title",
-                    "task_id", "task__title",
-                )
-                .annotate(
-                    minutes=Sum("duration_minutes"),
-                    billable=Sum("duration_minutes", filter=Q(billable=True)),
-                    entries=Count("id"),
-                    first=Min("work_date"),
-                    last=Max("work_date"),
-                )
+            agg_rows = []
+            for r in self.entry_totals(request):
+                names = (r["user__first_name"] or "", r["user__last_name"] or "", r["user__username"] or "")
+                order = tuple(n.casefold() for n in names)
+                project, task = r["project__title"], r["task__title"]
+                if ql and not (any(ql in n for n in order)
+                               or ql in project.casefold() or ql in task.casefold()):
+                    continue
+                agg_rows.append({
+                    "label": r["user_label"], "order": order, "project": project, "task": task,
+                    "minutes": r["minutes"] or 0, "billable": r["billable"] or 0, "entries": r["entries"],
+                    "first": r["first"], "last": r["last"],
+                })
+            _sort_rows(
+                agg_rows, sort,
+                _UPT_SORT_FIELDS,
+                tiebreak=lambda r: (r["order"], r["project"].casefold(), r["task"].casefold()),
             )
-            order_map = {
-                "hours": "minutes", "-hours": "-minutes",
-                "billable": "billable", "-billable": "-billable",
-                "entries": "entries", "-entries": "-entries",
-                "first": "first", "-first": "-first",
-                "last": "last", "-last": "-last",
-                "user": "user__first_name", "-user": "-user__first_name",
-                "project": "project__title", "-project": "-project__title",
-                "task": "task__title", "-task": "-task__title",
-            }
-            rows_qs = rows_qs.order_by(
-                order_map.get(sort, "-minutes"),
-                "user__first_name", "user__last_name", "user__username",
-                "project__title", "task__title"
-            )[: top or 50]
-
-            def _uname(r):
-                full = f"{(r.get('user__first_name') or '').strip()} {(r.get('user__last_name') or '').strip()}".strip()
-                return full or r.get("user__username") or f"User {r['user_id']}"
-
             rows = [{
-                "user": _uname(r),
-                "project": r["project__title"],
-                "task": r["task__title"],
-                "hours": _fmt_hours(r["minutes"] or 0),
-                "billable": _fmt_hours(r["billable"] or 0),
-                "entries": r["entries"] or 0,
+                "user": r["label"],
+                "project": r["project"],
+                "task": r["task"],
+                "hours": _fmt_hours(r["minutes"]),
+                "billable": _fmt_hours(r["billable"]),
+                "entries": r["entries"],
                 "first": r["first"],
                 "last": r["last"],
-            } for r in rows_qs]
-            keys = ["user", "project", "task", "hours", "billable", "entries", "first", "last"]
+            } for r in agg_rows[: top or 50]]
             title = "User × Project × Task"
             template = "timetracking/metrics/_table_upt.html"
 
         # Precompute sort UI so templates don't need {% if %} at all
-        sort_dir = {k: dir_for(k, sort) for k in keys}                       # "asc" | "desc" | None
-        sort_suffix = {k: (f" ({v})" if v else "") for k, v in sort_dir.items()}
-        sort_next = {k: next_sort_for(k, sort) for k in keys}
+        sort_dir, sort_suffix, sort_next = _sort_ui(kind, sort)
 
-        top_options = [
-            {"value": n, "label": f"Top {n}", "selected": (n == (top or (50 if kind == 'upt' else 20)))}
-            for n in (10, 20, 50, 100, 200)
-        ]
+        top_options = _top_options(kind, top)
 
         ctx = {
             "kind": kind,
@@ -778,45 +1098,57 @@ class MetricsTableView(MetricsBase):
             "sort_suffix": sort_suffix,
             "sort_dir": sort_dir,  # kept in case you want to show arrows/icons later
         }
-        return render(request, template, ctx)
+        return template, ctx
 
+@method_decorator(_METRICS_CONDITIONAL, name="get")
 class MetricsTrendView(MetricsBase):
     template_name = "timetracking/metrics/_trend.html"
 
     def get(self, request, *args, **kwargs):
+        return render(request, *self.fragment(request))
+
+    def fragment(self, request) -> Tuple[str, Dict[str, Any]]:
         qs = self.filtered_qs(request)
         _, d_from, d_to, _, _, interval, _ , _, _, _ = self.parse_params(request)
+        if not self.has_entries(request):
+            return self.template_name, {
+                "series_pct": [], "series_len": 0, "rows": [],
+                "interval": interval, "from": d_from, "to": d_to,
+            }
 
-        if interval == "day":
-            trunc = TruncDate("work_date")
-            fmt = "%Y-%m-%d"
-        elif interval == "month":
-            trunc = TruncMonth("work_date")
-            fmt = "%Y-%m"
-        else:
-            trunc = TruncWeek("work_date")
-            fmt = "%Y-W%W"
-
-        buckets = (
-            qs.annotate(period=trunc)
-              .values("period")
-              .annotate(
-                  minutes=Sum("duration_minutes"),
-                  billable=Sum("duration_minutes", filter=Q(billable=True)),
-                  entries=Count("id"),
-              )
-              .order_by("period")
+        # Group on the stored bucket columns (Trunc only for rows missing them). The
+        # dashboard re-requests this on every filter change, hence the short TTL.
+        period, fmt = _TREND_BUCKETS.get(interval, _TREND_BUCKETS["week"])
+        buckets = cache.get_or_set(
+            self.fragment_cache_key(request, "trend"),
+            lambda: list(
+                qs.values(period=period)
+                  .annotate(
+                      minutes=Sum("duration_minutes"),
+                      billable=Sum("duration_minutes", filter=Q(billable=True)),
+                      entries=Count("id"),
+                  )
+                  .order_by("period")
+            ),
+            30,
         )
 
-        series_abs = [int(b["minutes"] or 0) for b in buckets]
-        series_pct = _normalize_series(series_abs)
-
-        rows = [{
-            "period": b["period"].strftime(fmt) if hasattr(b["period"], "strftime") else str(b["period"]),
-            "hours": _fmt_hours(b["minutes"]),
-            "billable": _fmt_hours(b["billable"] or 0),
-            "entries": b["entries"],
-        } for b in buckets]
+        # One pass builds the rows, the raw series and its peak.
+        series_abs: List[int] = []
+        rows: List[Dict[str, Any]] = []
+        peak = 0
+        for b in buckets:
+            minutes = int(b["minutes"] or 0)
+            series_abs.append(minutes)
+            if minutes > peak:
+                peak = minutes
+            rows.append({
+                "period": fmt(b["period"]) if isinstance(b["period"], date) else str(b["period"]),
+                "hours": _fmt_hours(b["minutes"]),
+                "billable": _fmt_hours(b["billable"]),
+                "entries": b["entries"],
+            })
+        series_pct = _normalize_series(series_abs, peak)
 
         ctx = {
             "series_pct": series_pct,
@@ -826,4 +1158,25 @@ class MetricsTrendView(MetricsBase):
             "from": d_from,
             "to": d_to,
         }
-        return render(request, self.template_name, ctx)
\ No newline at end of file
+        return self.template_name, ctx
+
+
+class MetricsBundleView(MetricsBase):
+    """
+    First paint of the dashboard in one request: summary, trend and the projects/tasks
+    tables rendered back to back as hx-swap-oob fragments. They share one request's
+    parsed params, EXISTS probe and (project, task) totals. Later filter changes
+    still go to the per-fragment endpoints, which carry each table's own controls.
+    """
+
+    def get(self, request, *args, **kwargs):
+        parts = [
+            MetricsSummaryView().fragment(request),
+            MetricsTrendView().fragment(request),
+            MetricsTableView().fragment(request, "projects"),
+            MetricsTableView().fragment(request, "tasks"),
+        ]
+        return HttpResponse("".join(
+            render_to_string(template, {**ctx, "oob": True}, request=request)
+            for template, ctx in parts
+        ))
\ No newline at end of file